@@ -5,12 +5,30 @@ Vista operativa para monitoreo en tiempo real
 
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+from dashboard import cards
+from dashboard.calibration import compute_calibration
+from dashboard.core import completeness_text
+from dashboard.data import iter_frame
+from dashboard.drift import DEFAULT_RECALL_FLOOR, WINDOW_FREQS, RollingMetrics
+from dashboard.evaluation import latest_results
+from dashboard.export import FORMATS, export_to_static, iter_window
+from dashboard.live import (
+    get_snapshot_store,
+    get_status_view,
+    get_render_graph,
+    get_threshold_table,
+    get_trend_figure,
+    get_trend_window,
+    load_data,
+    publish_settings,
+)
+from dashboard.retention import EPISODE_THRESHOLD
+from dashboard.whatif import MAX_ALARMS
+
 # Configuración de la página
 st.set_page_config(
     page_title="Sistema de Predicción de Flood",
@@ -48,121 +66,152 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-def load_data():
+@st.cache_data(max_entries=8)
+def get_calibration(_snapshot, version, flood_threshold, n_bins=10):
     """
-    Carga los datos de predicción.
-    
-    NOTA: En producción, reemplazar con la salida directa del modelo entrenado.
+    Calibración del modelo, cacheada por versión de datos y umbral de flood.
     """
-    try:
-        # Intentar cargar desde diferentes ubicaciones posibles
-        paths = [
-            'prueba/salida_predicciones.csv',
-            'salida_predicciones.csv',
-            'data/salida_predicciones.csv'
-        ]
-        
-        df = None
-        for path in paths:
-            try:
-                df = pd.read_csv(path)
-                break
-            except FileNotFoundError:
-                continue
-        
-        if df is None:
-            st.warning("No se encontró el archivo de datos. Usando datos de ejemplo.")
-            # Crear datos de ejemplo para demostración
-            dates = pd.date_range(start='2025-01-01', periods=100, freq='30min')
-            df = pd.DataFrame({
-                'timestamp': dates,
-                'active_alarms': np.random.randint(100, 300, 100),
-                'probabilidad_flood': np.random.uniform(0, 1, 100),
-                'prediccion_flood': 0,
-                'flood_actual': 0
-            })
-            df['prediccion_flood'] = (df['probabilidad_flood'] >= 0.6).astype(int)
-            df['flood_actual'] = (df['active_alarms'] >= 225).astype(int)
-        
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df.sort_values('timestamp').reset_index(drop=True)
-        return df
-    except Exception as e:
-        st.error(f"Error cargando datos: {e}")
-        return None
+    df = _snapshot.df
+    flood_actual = df['active_alarms'].to_numpy() >= flood_threshold
+    return compute_calibration(df['probabilidad_flood'].to_numpy(), flood_actual, n_bins)
 
 
-def get_current_status(df, prob_threshold=0.6, flood_threshold=225):
+def plot_calibration(calibracion):
     """
-    Obtiene el estado actual del sistema (último registro).
+    Diagrama de confiabilidad: probabilidad media vs. frecuencia observada por bin.
     """
-    if len(df) == 0:
-        return None
+    bins = calibracion.bins
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=(bins['bin_inicio'] + bins['bin_fin']) / 2 * 100,
+        y=bins['frecuencia_observada'] * 100,
+        width=(bins['bin_fin'] - bins['bin_inicio']) * 100 * 0.9,
+        name='Frecuencia observada',
+        marker_color='#3DCD58',
+        customdata=bins[['n', 'prob_media']].to_numpy(),
+        hovertemplate='Predicción media: %{customdata[1]:.1%}<br>'
+                      'Flood observado: %{y:.1f}%<br>'
+                      'Registros: %{customdata[0]:,}<extra></extra>'
+    ))
     
-    # Último registro
-    ultimo = df.iloc[-1].copy()
+    fig.add_trace(go.Scatter(
+        x=[0, 100],
+        y=[0, 100],
+        mode='lines',
+        name='Calibración perfecta',
+        line=dict(color='#666666', width=1, dash='dash'),
+        hoverinfo='skip'
+    ))
     
-    # Recalcular predicción y flood actual
-    ultimo['prediccion_flood'] = 1 if ultimo['probabilidad_flood'] >= prob_threshold else 0
-    ultimo['flood_actual'] = 1 if ultimo['active_alarms'] >= flood_threshold else 0
+    fig.update_layout(
+        xaxis=dict(title='Probabilidad predicha (%)', range=[0, 100]),
+        yaxis=dict(title='Flood observado (%)', range=[0, 100]),
+        template='plotly_white',
+        height=350,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        margin=dict(l=50, r=50, t=20, b=50),
+        plot_bgcolor='#FFFFFF',
+        paper_bgcolor='#FFFFFF'
+    )
     
-    return ultimo
+    return fig
 
 
-def plot_simple_trend(df, flood_threshold=225, n_points=48):
+@st.cache_data(ttl=60)
+def get_evaluation_results():
+    """
+    Última evaluación con validación cruzada temporal (`python -m dashboard.evaluation`).
     """
-    Gráfico simple de tendencia de las últimas N horas.
+    return latest_results()
+
+
+@st.cache_resource(max_entries=8)
+def get_drift_monitor(freq, prob_threshold, flood_threshold):
     """
-    # Últimas N horas (n_points intervalos de 30 min)
-    df_recent = df.tail(n_points).copy()
+    Monitor de drift compartido entre reruns y sesiones.
     
+    Se sincroniza con los datos en cada rerun procesando sólo las filas nuevas.
+    """
+    return RollingMetrics(freq, prob_threshold, flood_threshold)
+
+
+def plot_drift(df_drift, recall_floor):
+    """
+    Gráfico de métricas por ventana con las ventanas en drift marcadas.
+    """
     fig = go.Figure()
     
-    # Línea de alarmas activas
+    for columna, nombre, color in [
+        ('recall', 'Recall', '#2E9A42'),
+        ('precision', 'Precision', '#3DCD58'),
+        ('f1', 'F1-Score', '#0066CC'),
+    ]:
+        fig.add_trace(go.Scatter(
+            x=df_drift.index,
+            y=df_drift[columna] * 100,
+            mode='lines+markers',
+            name=nombre,
+            line=dict(color=color, width=2),
+            hovertemplate='%{x|%d/%m/%Y}<br>' + nombre + ': %{y:.1f}%<extra></extra>'
+        ))
+    
+    fig.add_trace(go.Scatter(
+        x=df_drift.index,
+        y=df_drift['brier'],
+        mode='lines',
+        name='Brier',
+        line=dict(color='#666666', width=1, dash='dot'),
+        yaxis='y2',
+        hovertemplate='%{x|%d/%m/%Y}<br>Brier: %{y:.3f}<extra></extra>'
+    ))
     fig.add_trace(go.Scatter(
-        x=df_recent['timestamp'],
-        y=df_recent['active_alarms'],
+        x=df_drift.index,
+        y=df_drift['ece'],
         mode='lines',
-        name='Alarmas Activas',
-        line=dict(color='#3DCD58', width=3),
-        fill='tozeroy',
-        fillcolor='rgba(61, 205, 88, 0.1)',
-        hovertemplate='%{x}<br>Alarmas: %{y}<extra></extra>'
+        name='ECE',
+        line=dict(color='#FFA500', width=1, dash='dot'),
+        yaxis='y2',
+        hovertemplate='%{x|%d/%m/%Y}<br>ECE: %{y:.3f}<extra></extra>'
+    ))
+    
+    en_drift = df_drift[df_drift['drift']]
+    fig.add_trace(go.Scatter(
+        x=en_drift.index,
+        y=en_drift['recall'] * 100,
+        mode='markers',
+        name='Drift',
+        marker=dict(color='#DC143C', size=12, symbol='x'),
+        hovertemplate='%{x|%d/%m/%Y}<br>Recall bajo el mínimo: %{y:.1f}%<extra></extra>'
     ))
     
-    # Umbral de flood
     fig.add_hline(
-        y=flood_threshold,
+        y=recall_floor * 100,
         line_dash="dash",
         line_color="#DC143C",
         line_width=2,
-        annotation_text=f"Umbral: {flood_threshold}",
+        annotation_text=f"Recall mínimo: {recall_floor:.0%}",
         annotation_position="right"
     )
     
-    # Probabilidad de flood (eje secundario)
-    fig.add_trace(go.Scatter(
-        x=df_recent['timestamp'],
-        y=df_recent['probabilidad_flood'] * 100,
-        mode='lines',
-        name='Probabilidad Flood (%)',
-        line=dict(color='#2E9A42', width=2, dash='dot'),
-        yaxis='y2',
-        hovertemplate='%{x}<br>Probabilidad: %{y:.1f}%<extra></extra>'
-    ))
-    
     fig.update_layout(
-        xaxis_title='Tiempo',
-        yaxis_title='Alarmas Activas',
+        xaxis_title='Ventana',
+        yaxis=dict(title='Métrica (%)', range=[0, 105]),
         yaxis2=dict(
-            title='Probabilidad Flood (%)',
+            title='Brier / ECE',
             overlaying='y',
             side='right',
-            range=[0, 100]
+            range=[0, 1]
         ),
         hovermode='x unified',
         template='plotly_white',
-        height=400,
+        height=350,
         legend=dict(
             orientation="h",
             yanchor="bottom",
@@ -178,13 +227,169 @@ def plot_simple_trend(df, flood_threshold=225, n_points=48):
     return fig
 
 
+def render_export(df, prob_threshold, flood_threshold):
+    """
+    Exporta la ventana seleccionada por bloques a la carpeta estática.
+    
+    El archivo se sirve desde disco, sin armar el resultado completo en memoria;
+    si excede el límite de archivos estáticos de Streamlit se entrega en partes.
+    """
+    fecha_min = df['timestamp'].iloc[0].date()
+    fecha_max = df['timestamp'].iloc[-1].date()
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        rango = st.date_input(
+            "Rango de fechas",
+            value=(fecha_min, fecha_max),
+            min_value=fecha_min,
+            max_value=fecha_max
+        )
+    with col2:
+        formato = st.selectbox("Formato", list(FORMATS))
+    
+    if not st.button("Generar exportación"):
+        return
+    if len(rango) != 2:
+        st.warning("Seleccioná fecha inicial y final.")
+        return
+    
+    desde = pd.Timestamp(rango[0])
+    hasta = pd.Timestamp(rango[1]) + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1)
+    chunks = iter_window(iter_frame(df), desde, hasta, prob_threshold, flood_threshold)
+    try:
+        filenames, n_rows = export_to_static(chunks, formato)
+    except ImportError as e:
+        st.error(str(e))
+        return
+    
+    if len(filenames) == 1:
+        st.success(f"{n_rows:,} filas exportadas.")
+    else:
+        st.success(f"{n_rows:,} filas exportadas en {len(filenames)} partes (límite de tamaño de Streamlit).")
+    for filename in filenames:
+        st.markdown(f"[Descargar {filename}](app/static/exports/{filename})")
+
+
+# ==========================================
+# SECCIONES (nodos del grafo de render)
+# ==========================================
+
+def compute_status(snapshot, prob_threshold, flood_threshold):
+    """Estado actual y tarjetas principales."""
+    return get_status_view(snapshot, snapshot.version, prob_threshold, flood_threshold)
+
+
+def compute_info(vista, edad):
+    """Columnas de información adicional (HTML de las cuatro tarjetas)."""
+    tarjetas = vista['tarjetas']
+    return [
+        cards.timestamp_card(vista['estado']['timestamp'], edad),
+        tarjetas['riesgo'],
+        tarjetas['flood_actual'],
+        tarjetas['proximo_flood'],
+    ]
+
+
+def compute_trend(snapshot, flood_threshold, horas):
+    """Figura de tendencia y texto de completitud de la ventana."""
+    fig = get_trend_figure(snapshot, snapshot.version, flood_threshold, horas)
+    ventana = get_trend_window(snapshot, snapshot.version, horas)
+    return fig, completeness_text(ventana)
+
+
+def compute_metrics(snapshot, prob_threshold, flood_threshold):
+    """
+    Métricas básicas desde los conteos acumulados (todo el historial, incluso
+    lo que ya salió de la ventana cruda en modo de memoria acotada).
+    """
+    conteos = get_threshold_table(snapshot, snapshot.version).confusion(prob_threshold, flood_threshold)
+    tp, tn, fp, fn = (int(conteos[k]) for k in ('tp', 'tn', 'fp', 'fn'))
+    
+    total = tp + tn + fp + fn
+    accuracy = (tp + tn) / total if total > 0 else 0
+    precision = tp / (tp + fp) if (tp + fp) > 0 else 0
+    recall = tp / (tp + fn) if (tp + fn) > 0 else 0
+    f1 = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
+    
+    return {
+        'metricas': {'Accuracy': accuracy, 'Precision': precision, 'Recall': recall, 'F1-Score': f1},
+        'matriz': cards.confusion_matrix_table(tn, fp, fn, tp),
+    }
+
+
+def compute_history(snapshot):
+    """Resumen del historial compacto (modo de memoria acotada)."""
+    historial = snapshot.history
+    if historial is None:
+        return None
+    episodios = historial.all_episodes()
+    texto = (
+        f"Modo de memoria acotada: {len(snapshot.df):,} filas crudas (últimos {historial.horizon_days} días) "
+        f"de {historial.n_rows:,} procesadas; {len(historial.rollups):,} rollups diarios y "
+        f"{len(episodios):,} episodios de flood (≥ {EPISODE_THRESHOLD} alarmas). "
+        "Calibración y drift usan la ventana cruda."
+    )
+    return texto, episodios.tail(10).iloc[::-1]
+
+
+def compute_calibration_section(snapshot, flood_threshold):
+    """Calibración y su diagrama de confiabilidad."""
+    calibracion = get_calibration(snapshot, snapshot.version, flood_threshold)
+    return calibracion, plot_calibration(calibracion)
+
+
+def compute_drift(snapshot, freq, prob_threshold, flood_threshold, recall_floor):
+    """Métricas por ventana y gráfico de drift."""
+    monitor = get_drift_monitor(freq, prob_threshold, flood_threshold).sync(snapshot.df)
+    df_drift = monitor.frame(recall_floor)
+    return int(df_drift['drift'].sum()), plot_drift(df_drift, recall_floor)
+
+
+def build_render_graph():
+    """
+    Declara las secciones del dashboard con sus entradas.
+    
+    Un rerun con las mismas entradas (cambio de foco, reconexión) reutiliza
+    los resultados anteriores en lugar de recalcularlos.
+    """
+    grafo = get_render_graph()
+    umbrales = ('snapshot', 'prob_threshold', 'flood_threshold')
+    grafo.define('estado', compute_status, inputs=umbrales)
+    grafo.define('informacion', compute_info, inputs=('edad',), deps=('estado',))
+    grafo.define('tendencia', compute_trend, inputs=('snapshot', 'flood_threshold', 'horas'))
+    grafo.define('metricas', compute_metrics, inputs=umbrales)
+    grafo.define('historial', compute_history, inputs=('snapshot',))
+    grafo.define('calibracion', compute_calibration_section, inputs=('snapshot', 'flood_threshold'))
+    grafo.define('drift', compute_drift, inputs=('snapshot', 'freq') + umbrales[1:] + ('recall_floor',))
+    return grafo
+
+
+def render_graph_stats(grafo):
+    """Contadores de aciertos y fallos por sección, para ajustar las entradas."""
+    with st.expander("Rendimiento del render"):
+        st.dataframe(
+            grafo.stats_frame(),
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                'tasa_aciertos': st.column_config.NumberColumn(format='percent'),
+                'ms_ultimo': st.column_config.NumberColumn(format='%.2f'),
+                'ms_total': st.column_config.NumberColumn(format='%.1f'),
+            }
+        )
+        if st.button("Reiniciar contadores"):
+            grafo.reset_stats()
+
+
 def main():
     """Función principal de la aplicación."""
     
-    # Cargar datos
-    df = load_data()
-    if df is None:
+    # Cargar datos (último snapshot completo, sin esperar I/O)
+    snapshot = load_data()
+    if snapshot is None:
         st.stop()
+    df = snapshot.df
     
     # Sidebar mínimo
     with st.sidebar:
@@ -212,10 +417,19 @@ def main():
         flood_threshold = st.number_input(
             "Umbral de alarmas para flood",
             min_value=0,
+            max_value=MAX_ALARMS,
             value=225,
             step=10
         )
         
+        recall_floor = st.slider(
+            "Recall mínimo (drift)",
+            min_value=0.0,
+            max_value=1.0,
+            value=DEFAULT_RECALL_FLOOR,
+            step=0.05
+        )
+        
         horas_visualizar = st.slider(
             "Horas a visualizar",
             min_value=6,
@@ -224,12 +438,29 @@ def main():
             step=6
         )
     
-    # Obtener estado actual
-    estado_actual = get_current_status(df, prob_threshold, flood_threshold)
+    publish_settings(
+        prob_threshold=prob_threshold,
+        flood_threshold=flood_threshold,
+        horas_visualizar=horas_visualizar
+    )
+    
+    # Cada sección se recalcula sólo si cambiaron sus entradas
+    grafo = build_render_graph()
+    grafo.update(
+        snapshot=snapshot,
+        prob_threshold=prob_threshold,
+        flood_threshold=flood_threshold,
+        recall_floor=recall_floor,
+        horas=horas_visualizar,
+        edad=cards.round_age(get_snapshot_store().age_seconds())
+    )
+    
+    vista = grafo.get('estado')
     
-    if estado_actual is None:
+    if vista is None:
         st.error("No hay datos disponibles")
         st.stop()
+    tarjetas = vista['tarjetas']
     
     # ==========================================
     # SECCIÓN PRINCIPAL: ESTADO ACTUAL
@@ -252,115 +483,20 @@ def main():
     
     with col1:
         # Predicción principal
-        if estado_actual['prediccion_flood'] == 1:
-            st.markdown("""
-            <div style='background-color: #DC143C; color: white; padding: 2rem; border-radius: 12px; text-align: center;'>
-                <h1 style='color: white; margin: 0; font-size: 3rem;'>ALERTA DE FLOOD</h1>
-                <p style='font-size: 1.2rem; margin-top: 1rem;'>Se predice flood de alarmas en las próximas 2 horas</p>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            st.markdown("""
-            <div style='background-color: #3DCD58; color: white; padding: 2rem; border-radius: 12px; text-align: center;'>
-                <h1 style='color: white; margin: 0; font-size: 3rem;'>ESTADO NORMAL</h1>
-                <p style='font-size: 1.2rem; margin-top: 1rem;'>No se predice flood en las próximas 2 horas</p>
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown(tarjetas['estado'], unsafe_allow_html=True)
     
     with col2:
-        st.markdown("""
-        <div style='background-color: #FFFFFF; padding: 1.5rem; border-radius: 12px; border: 2px solid #E5E5E5; text-align: center;'>
-            <div style='color: #333333; font-size: 0.9rem; margin-bottom: 0.5rem;'>PROBABILIDAD DE FLOOD</div>
-            <div style='color: #2E9A42; font-size: 3rem; font-weight: 700;'>{:.1f}%</div>
-            <div style='color: #666666; font-size: 0.8rem; margin-top: 0.5rem;'>Próximas 2 horas</div>
-        </div>
-        """.format(estado_actual['probabilidad_flood'] * 100), unsafe_allow_html=True)
+        st.markdown(tarjetas['probabilidad'], unsafe_allow_html=True)
     
     with col3:
-        st.markdown("""
-        <div style='background-color: #FFFFFF; padding: 1.5rem; border-radius: 12px; border: 2px solid #E5E5E5; text-align: center;'>
-            <div style='color: #333333; font-size: 0.9rem; margin-bottom: 0.5rem;'>ALARMAS ACTIVAS</div>
-            <div style='color: #2E9A42; font-size: 3rem; font-weight: 700;'>{}</div>
-            <div style='color: #666666; font-size: 0.8rem; margin-top: 0.5rem;'>En este momento</div>
-        </div>
-        """.format(int(estado_actual['active_alarms'])), unsafe_allow_html=True)
+        st.markdown(tarjetas['alarmas'], unsafe_allow_html=True)
     
     st.markdown("---")
     
-    # Información adicional
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown(f"""
-        <div style='background-color: #FFFFFF; padding: 1rem; border-radius: 8px; border-left: 4px solid #3DCD58;'>
-            <div style='color: #666666; font-size: 0.85rem;'>Última actualización</div>
-            <div style='color: #333333; font-size: 1.1rem; font-weight: 600; margin-top: 0.5rem;'>
-                {estado_actual['timestamp'].strftime('%H:%M:%S')}
-            </div>
-            <div style='color: #666666; font-size: 0.8rem; margin-top: 0.2rem;'>
-                {estado_actual['timestamp'].strftime('%d/%m/%Y')}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        # Determinar nivel de riesgo
-        prob = estado_actual['probabilidad_flood']
-        if prob >= 0.7:
-            riesgo = "ALTO"
-            color_riesgo = "#DC143C"
-        elif prob >= 0.4:
-            riesgo = "MEDIO"
-            color_riesgo = "#FFA500"
-        else:
-            riesgo = "BAJO"
-            color_riesgo = "#3DCD58"
-        
-        st.markdown(f"""
-        <div style='background-color: #FFFFFF; padding: 1rem; border-radius: 8px; border-left: 4px solid {color_riesgo};'>
-            <div style='color: #666666; font-size: 0.85rem;'>Nivel de Riesgo</div>
-            <div style='color: {color_riesgo}; font-size: 1.1rem; font-weight: 600; margin-top: 0.5rem;'>
-                {riesgo}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        flood_actual = "SÍ" if estado_actual['flood_actual'] == 1 else "NO"
-        color_flood = "#DC143C" if estado_actual['flood_actual'] == 1 else "#3DCD58"
-        
-        st.markdown(f"""
-        <div style='background-color: #FFFFFF; padding: 1rem; border-radius: 8px; border-left: 4px solid {color_flood};'>
-            <div style='color: #666666; font-size: 0.85rem;'>Flood Actual</div>
-            <div style='color: {color_flood}; font-size: 1.1rem; font-weight: 600; margin-top: 0.5rem;'>
-                {flood_actual}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        # Tiempo hasta próximo flood (si se predice)
-        if estado_actual['prediccion_flood'] == 1:
-            tiempo_texto = "Inminente"
-        else:
-            # Buscar próxima predicción de flood
-            futuras = df[df['timestamp'] > estado_actual['timestamp']]
-            futuras_flood = futuras[futuras['probabilidad_flood'] >= prob_threshold]
-            if len(futuras_flood) > 0:
-                tiempo_dif = futuras_flood.iloc[0]['timestamp'] - estado_actual['timestamp']
-                horas = tiempo_dif.total_seconds() / 3600
-                tiempo_texto = f"{horas:.1f} horas"
-            else:
-                tiempo_texto = "No previsto"
-        
-        st.markdown(f"""
-        <div style='background-color: #FFFFFF; padding: 1rem; border-radius: 8px; border-left: 4px solid #2E9A42;'>
-            <div style='color: #666666; font-size: 0.85rem;'>Próximo Flood</div>
-            <div style='color: #333333; font-size: 1.1rem; font-weight: 600; margin-top: 0.5rem;'>
-                {tiempo_texto}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+    # Información adicional (última actualización, riesgo, flood actual, próximo flood)
+    for col, tarjeta in zip(st.columns(4), grafo.get('informacion')):
+        with col:
+            st.markdown(tarjeta, unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -369,9 +505,13 @@ def main():
     # ==========================================
     st.markdown("## Tendencias Recientes")
     
-    n_points = int(horas_visualizar * 2)  # Convertir horas a intervalos de 30 min
-    fig_trend = plot_simple_trend(df, flood_threshold, n_points)
+    # Ventana por tiempo: los huecos en los datos se muestran como cortes
+    fig_trend, completitud = grafo.get('tendencia')
     st.plotly_chart(fig_trend, use_container_width=True)
+    st.caption(completitud)
+    
+    with st.expander("Exportar datos"):
+        render_export(df, prob_threshold, flood_threshold)
     
     st.markdown("---")
     
@@ -379,59 +519,71 @@ def main():
     # INFORMACIÓN ADICIONAL (colapsable)
     # ==========================================
     with st.expander("Información Técnica del Modelo"):
-        # Calcular métricas básicas
-        df['prediccion_flood'] = (df['probabilidad_flood'] >= prob_threshold).astype(int)
-        df['flood_actual'] = (df['active_alarms'] >= flood_threshold).astype(int)
-        
-        tp = ((df['prediccion_flood'] == 1) & (df['flood_actual'] == 1)).sum()
-        tn = ((df['prediccion_flood'] == 0) & (df['flood_actual'] == 0)).sum()
-        fp = ((df['prediccion_flood'] == 1) & (df['flood_actual'] == 0)).sum()
-        fn = ((df['prediccion_flood'] == 0) & (df['flood_actual'] == 1)).sum()
-        
-        total = len(df)
-        accuracy = (tp + tn) / total if total > 0 else 0
-        precision = tp / (tp + fp) if (tp + fp) > 0 else 0
-        recall = tp / (tp + fn) if (tp + fn) > 0 else 0
-        f1 = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
+        metricas = grafo.get('metricas')
         
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("### Métricas del Modelo")
-            st.metric("Accuracy", f"{accuracy:.2%}")
-            st.metric("Precision", f"{precision:.2%}")
-            st.metric("Recall", f"{recall:.2%}")
-            st.metric("F1-Score", f"{f1:.2%}")
+            for nombre, valor in metricas['metricas'].items():
+                st.metric(nombre, f"{valor:.2%}")
         
         with col2:
             st.markdown("### Matriz de Confusión")
-            st.markdown(f"""
-            <table style='width: 100%; border-collapse: collapse;'>
-                <tr style='background-color: #2E9A42; color: white;'>
-                    <th style='padding: 0.5rem;'></th>
-                    <th style='padding: 0.5rem;'>Pred No Flood</th>
-                    <th style='padding: 0.5rem;'>Pred Flood</th>
-                </tr>
-                <tr>
-                    <td style='background-color: #F5F5F5; font-weight: 600; padding: 0.5rem;'>Real No Flood</td>
-                    <td style='padding: 0.5rem; text-align: center;'>{tn:,}</td>
-                    <td style='padding: 0.5rem; text-align: center; color: #DC143C;'>{fp:,}</td>
-                </tr>
-                <tr>
-                    <td style='background-color: #F5F5F5; font-weight: 600; padding: 0.5rem;'>Real Flood</td>
-                    <td style='padding: 0.5rem; text-align: center; color: #DC143C;'>{fn:,}</td>
-                    <td style='padding: 0.5rem; text-align: center; color: #2E9A42; font-weight: 600;'>{tp:,}</td>
-                </tr>
-            </table>
-            """, unsafe_allow_html=True)
+            st.markdown(metricas['matriz'], unsafe_allow_html=True)
+        
+        historial = grafo.get('historial')
+        if historial is not None:
+            st.markdown("### Historial Compacto")
+            texto, episodios = historial
+            st.caption(texto)
+            st.dataframe(episodios, hide_index=True, use_container_width=True)
+        
+        st.markdown("### Calibración")
+        calibracion, fig_calibracion = grafo.get('calibracion')
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            st.metric("Brier Score", f"{calibracion.brier:.4f}")
+            st.metric("ECE", f"{calibracion.ece:.2%}")
+            st.caption(
+                "Un modelo bien calibrado tiene barras sobre la diagonal: "
+                "de las predicciones de 70%, alrededor del 70% termina en flood."
+            )
+        with col2:
+            st.plotly_chart(fig_calibracion, use_container_width=True)
+        
+        st.markdown("### Validación Cruzada Temporal")
+        run, folds = get_evaluation_results()
+        if run is None:
+            st.caption("Sin evaluaciones registradas. Ejecutar `python -m dashboard.evaluation`.")
+        else:
+            st.markdown(
+                f"Última evaluación ({run['creado_en']}): **{run['modelo']}**, "
+                f"{run['n_candidatos']} candidatos × {run['n_folds']} folds en "
+                f"{run['segundos']:.0f} s con {run['workers']} procesos. "
+                f"Mejor candidato: F1 medio **{run['f1_medio']:.2%}** con umbral {run['umbral']:.2f}."
+            )
+            st.caption(f"Parámetros: `{run['params']}`")
+            st.dataframe(folds, hide_index=True, use_container_width=True)
+        
+        st.markdown("### Drift del Modelo")
+        freq = st.radio(
+            "Ventana",
+            list(WINDOW_FREQS),
+            format_func=WINDOW_FREQS.get,
+            horizontal=True
+        )
+        n_drift, fig_drift = grafo.update(freq=freq).get('drift')
+        if n_drift > 0:
+            st.warning(f"{n_drift} ventana(s) con recall por debajo de {recall_floor:.0%}")
+        st.plotly_chart(fig_drift, use_container_width=True)
+    
+    with st.sidebar:
+        render_graph_stats(grafo)
     
     # Footer
     st.markdown("---")
-    st.markdown("""
-    <div style='text-align: center; color: #666666; padding: 1rem; font-size: 0.85rem;'>
-        Sistema de Predicción de Flood de Alarmas - Horizonte: 2 horas | Modelo Base (XGBoost)
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(cards.FOOTER, unsafe_allow_html=True)
 
 
 if __name__ == "__main__":
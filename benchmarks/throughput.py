@@ -0,0 +1,118 @@
+"""
+Benchmark de throughput: un proceso de Streamlit vs. varios workers.
+
+Publica un snapshot sintético en un directorio compartido (`dashboard.shm`)
+y ejecuta reruns completos de `app.py` (con `streamlit.testing`) en 1 y en N
+procesos a la vez, todos leyendo el mismo snapshot mapeado en memoria.
+Reporta reruns por segundo y memoria por proceso: el PSS reparte las
+páginas compartidas entre los procesos, así que si el dataset no se
+duplica, el PSS por worker baja al sumar workers.
+
+Es una aproximación del despliegue de `dashboard.cluster`, no una medición
+de él: los reruns corren en procesos independientes con `AppTest`, sin pasar
+por el balanceador ni por el servidor de Streamlit (websocket y envío de
+mensajes al navegador). Mide el costo de ejecutar `app.py` sobre el snapshot
+compartido; la latencia del proxy y del servidor no está incluida. Además,
+el balanceador asigna por IP: clientes que salen de una misma IP (por
+ejemplo, un generador de carga en un solo host) van todos al mismo worker.
+
+Uso:
+    python benchmarks/throughput.py --workers 1,4 --rows 1000000 --seconds 30
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from dashboard.shm import publish_snapshot  # noqa: E402
+from dashboard.snapshot import Snapshot  # noqa: E402
+from dashboard.synthetic import generate_history  # noqa: E402
+
+APP_PATH = os.path.join(ROOT_DIR, 'app.py')
+
+
+def _memory_mb():
+    """RSS y PSS del proceso actual en MB (Linux)."""
+    valores = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            campo, _, resto = line.partition(':')
+            if campo in ('Rss', 'Pss'):
+                valores[campo] = int(resto.split()[0]) / 1024
+    return valores.get('Rss', 0.0), valores.get('Pss', 0.0)
+
+
+def _worker(barrier, seconds, results):
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(ROOT_DIR)
+    app = AppTest.from_file(APP_PATH, default_timeout=120)
+    app.run()  # calentamiento: mapea el snapshot y llena los caches
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+
+    barrier.wait()
+    reruns = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        app.run()
+        reruns += 1
+    # Todos miden memoria con los demás procesos todavía vivos
+    rss, pss = _memory_mb()
+    barrier.wait()
+    results.put((reruns, rss, pss))
+
+
+def run(n_workers, seconds):
+    ctx = mp.get_context('spawn')
+    barrier = ctx.Barrier(n_workers)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(barrier, seconds, results)) for _ in range(n_workers)]
+    for proc in procs:
+        proc.start()
+    salida = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+
+    reruns = sum(r for r, _, _ in salida)
+    return {
+        'procesos': n_workers,
+        'reruns_s': reruns / seconds,
+        'rss_mb': sum(rss for _, rss, _ in salida) / n_workers,
+        'pss_mb': sum(pss for _, _, pss in salida) / n_workers,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Throughput de reruns de app.py en 1 vs N procesos (aproximación del cluster, sin balanceador).")
+    parser.add_argument('--workers', default=f"1,{os.cpu_count() or 1}",
+                        help="Cantidades de procesos a medir, separadas por coma")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--seconds', type=float, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='ypf_bench_') as shared_dir:
+        df = generate_history(args.rows)
+        publish_snapshot(Snapshot(df, ('benchmark', args.rows), 'benchmark'), shared_dir)
+        del df
+        # Los procesos hijos (spawn) heredan el entorno
+        os.environ['FLOOD_SHARED_SNAPSHOT_DIR'] = shared_dir
+
+        print(f"{'procesos':>8} {'reruns/s':>10} {'x base':>7} {'RSS MB':>8} {'PSS MB':>8}")
+        base = None
+        for n in sorted({int(v) for v in args.workers.split(',')}):
+            r = run(n, args.seconds)
+            base = base or r['reruns_s']
+            print(f"{r['procesos']:>8} {r['reruns_s']:>10.2f} {r['reruns_s'] / base:>7.2f} "
+                  f"{r['rss_mb']:>8.0f} {r['pss_mb']:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
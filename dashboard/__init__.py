@@ -0,0 +1,8 @@
+"""
+Núcleo compartido del dashboard de predicción de flood de alarmas.
+
+Los módulos de este paquete no dependen de Streamlit, de modo que pueden
+usarse tanto desde `app.py` y `pages/` como desde scripts de línea de comandos.
+La excepción es `dashboard.live`, que cachea con Streamlit los objetos que
+comparten el dashboard y sus páginas.
+"""
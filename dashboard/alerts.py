@@ -0,0 +1,415 @@
+"""
+Despachador de alertas en segundo plano.
+
+Corre independiente de las sesiones del navegador: observa las filas nuevas
+del archivo de predicciones, detecta transiciones de `prediccion_flood` y
+`flood_actual` (con debounce) y reparte las notificaciones a sinks
+intercambiables a través de una cola asyncio. Se mide la latencia desde que
+la fila llega (fecha de modificación del CSV al leerla) hasta que cada sink
+termina de notificar; incluye la espera del sondeo.
+
+Uso:
+
+    python -m dashboard.alerts --sink file:alertas.ndjson --sink webhook:http://127.0.0.1:8700/ --sink syslog
+    python -m dashboard.alerts --receptor 8700    # receptor local de webhooks (stand-in)
+"""
+
+import abc
+import argparse
+import asyncio
+import io
+import json
+import logging
+import logging.handlers
+import os
+import time
+import urllib.request
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from dashboard.data import find_data_path
+
+logger = logging.getLogger(__name__)
+
+SIGNALS = ('prediccion_flood', 'flood_actual')
+DEFAULT_DEBOUNCE_ROWS = 2
+DEFAULT_POLL_SECONDS = 1.0
+TAIL_SEED_BYTES = 64 * 1024
+
+
+class TransitionDetector:
+    """
+    Detecta cambios de estado de las señales de flood con debounce.
+
+    Un cambio sólo se confirma cuando el nuevo valor se mantiene durante
+    `debounce_rows` filas consecutivas, así una fila aislada no dispara
+    (ni cancela) una alerta.
+    """
+
+    def __init__(self, prob_threshold=0.6, flood_threshold=225, debounce_rows=DEFAULT_DEBOUNCE_ROWS):
+        self.prob_threshold = prob_threshold
+        self.flood_threshold = flood_threshold
+        self.debounce_rows = max(1, debounce_rows)
+        self.state = {signal: None for signal in SIGNALS}
+        self._pending = {signal: (None, 0) for signal in SIGNALS}
+
+    def signals(self, df):
+        """Valores 0/1 de cada señal, recalculados con los umbrales del detector."""
+        return {
+            'prediccion_flood': (df['probabilidad_flood'].to_numpy() >= self.prob_threshold).astype(int),
+            'flood_actual': (df['active_alarms'].to_numpy() >= self.flood_threshold).astype(int),
+        }
+
+    def seed(self, df):
+        """Fija el estado inicial con las filas existentes sin emitir eventos."""
+        if len(df) == 0:
+            return
+        for signal, values in self.signals(df).items():
+            self.state[signal] = int(values[-1])
+            self._pending[signal] = (None, 0)
+
+    def feed(self, df, arrival=None):
+        """
+        Procesa filas nuevas y devuelve la lista de eventos confirmados.
+
+        Args:
+            df: Filas nuevas, ordenadas por timestamp.
+            arrival: Instante (`time.time`) en que llegaron las filas.
+        """
+        arrival = time.time() if arrival is None else arrival
+        eventos = []
+        timestamps = df['timestamp'].to_numpy()
+        for signal, values in self.signals(df).items():
+            for i in range(len(values)):
+                value = int(values[i])
+                if self.state[signal] is None:
+                    self.state[signal] = value
+                    continue
+                if value == self.state[signal]:
+                    self._pending[signal] = (None, 0)
+                    continue
+                candidate, count = self._pending[signal]
+                count = count + 1 if candidate == value else 1
+                if count < self.debounce_rows:
+                    self._pending[signal] = (value, count)
+                    continue
+                self.state[signal] = value
+                self._pending[signal] = (None, 0)
+                fila = df.iloc[i]
+                eventos.append({
+                    'senal': signal,
+                    'estado': value,
+                    'estado_alerta': 'ALERTA' if value else 'NORMAL',
+                    'timestamp': pd.Timestamp(timestamps[i]).isoformat(),
+                    'probabilidad_flood': float(fila['probabilidad_flood']),
+                    'active_alarms': int(fila['active_alarms']),
+                    '_llegada': arrival,
+                })
+        eventos.sort(key=lambda e: e['timestamp'])
+        return eventos
+
+
+class CsvTail:
+    """
+    Lee sólo las filas agregadas al final del CSV de predicciones.
+
+    Guarda el offset en bytes; si el archivo se trunca o se reemplaza, vuelve
+    a empezar desde el final del archivo nuevo.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = None
+        self.header = None
+        # Fecha de modificación (`time.time`) del archivo en la última lectura:
+        # es el instante en que se escribió la última fila leída
+        self.mtime = None
+        self._inode = None
+
+    def _read_header(self, f):
+        f.seek(0)
+        self.header = f.readline().decode('utf-8').strip().split(',')
+
+    def seed(self):
+        """Posiciona al final del archivo y devuelve las últimas filas existentes."""
+        with open(self.path, 'rb') as f:
+            self._read_header(f)
+            header_end = f.tell()
+            stat = os.fstat(f.fileno())
+            size = stat.st_size
+            self._inode = stat.st_ino
+            self.mtime = stat.st_mtime
+            start = max(header_end, size - TAIL_SEED_BYTES)
+            f.seek(start)
+            data = f.read(size - start)
+        lines = data.split(b'\n')
+        if start > header_end and len(lines) > 1:
+            lines = lines[1:]  # el seek cayó a mitad de una línea
+        complete = b'\n'.join(lines[:-1])
+        self.offset = size - len(lines[-1])
+        return self._parse(complete)
+
+    def read_new(self):
+        """Devuelve las filas completas agregadas desde la última lectura."""
+        if self.offset is None:
+            return self.seed()
+        stat = os.stat(self.path)
+        if stat.st_ino != self._inode or stat.st_size < self.offset:
+            logger.info("Archivo %s reemplazado; se reinicia la lectura", self.path)
+            self.seed()
+            return self._parse(b'')
+        if stat.st_size == self.offset:
+            return self._parse(b'')
+        self.mtime = stat.st_mtime
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+        end = data.rfind(b'\n') + 1
+        self.offset += end
+        return self._parse(data[:end])
+
+    def _parse(self, data):
+        if not data.strip():
+            return pd.DataFrame(columns=self.header)
+        df = pd.read_csv(io.BytesIO(data), names=self.header, header=None)
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        return df
+
+
+class LatencyStats:
+    """Latencias de despacho (segundos) de las últimas notificaciones."""
+
+    def __init__(self, maxlen=1000):
+        self.samples = deque(maxlen=maxlen)
+        self.count = 0
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self):
+        if not self.samples:
+            return {'n': 0}
+        values = np.fromiter(self.samples, dtype=float)
+        return {
+            'n': self.count,
+            'media_ms': float(values.mean() * 1000),
+            'p50_ms': float(np.percentile(values, 50) * 1000),
+            'p95_ms': float(np.percentile(values, 95) * 1000),
+            'max_ms': float(values.max() * 1000),
+        }
+
+
+# ==========================================
+# SINKS
+# ==========================================
+
+class Sink(abc.ABC):
+    """Destino de notificaciones. Las subclases implementan `emit` (bloqueante)."""
+
+    name = 'sink'
+
+    @abc.abstractmethod
+    def emit(self, evento):
+        """Envía un evento; se ejecuta fuera del loop de asyncio."""
+
+    async def send(self, evento):
+        # Los sinks hacen I/O bloqueante; se ejecutan fuera del loop
+        await asyncio.to_thread(self.emit, evento)
+
+    def close(self):
+        pass
+
+
+class FileSink(Sink):
+    """Agrega cada alerta como una línea JSON (NDJSON)."""
+
+    name = 'file'
+
+    def __init__(self, path):
+        self.path = path
+
+    def emit(self, evento):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(evento, ensure_ascii=False) + '\n')
+
+
+class WebhookSink(Sink):
+    """POST JSON a una URL (por ejemplo, el receptor local `--receptor`)."""
+
+    name = 'webhook'
+
+    def __init__(self, url, timeout=5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def emit(self, evento):
+        body = json.dumps(evento, ensure_ascii=False).encode('utf-8')
+        request = urllib.request.Request(
+            self.url, data=body, headers={'Content-Type': 'application/json'}, method='POST'
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class SyslogSink(Sink):
+    """Envía las alertas a syslog (socket local o host:puerto UDP)."""
+
+    name = 'syslog'
+
+    def __init__(self, address='/dev/log'):
+        self.handler = logging.handlers.SysLogHandler(address=address)
+        self.handler.setFormatter(logging.Formatter('flood-alarms: %(message)s'))
+
+    def emit(self, evento):
+        level = logging.WARNING if evento['estado'] else logging.INFO
+        mensaje = f"{evento['senal']}={evento['estado_alerta']} {evento['timestamp']} " \
+                  f"prob={evento['probabilidad_flood']:.3f} alarmas={evento['active_alarms']}"
+        self.handler.emit(logging.LogRecord('flood', level, __file__, 0, mensaje, None, None))
+
+    def close(self):
+        self.handler.close()
+
+
+def parse_sink(spec):
+    """
+    Construye un sink a partir de su especificación de línea de comandos.
+
+    `file:ruta`, `webhook:url`, `syslog` o `syslog:host:puerto`.
+    """
+    kind, _, target = spec.partition(':')
+    if kind == 'file' and target:
+        return FileSink(target)
+    if kind == 'webhook' and target:
+        return WebhookSink(target)
+    if kind == 'syslog':
+        if target:
+            host, _, port = target.rpartition(':')
+            return SyslogSink((host, int(port)))
+        return SyslogSink()
+    raise ValueError(f"Sink inválido: {spec}")
+
+
+# ==========================================
+# LOOP DE EVALUACIÓN
+# ==========================================
+
+class AlertDispatcher:
+    """Observa el origen de datos y despacha los eventos a los sinks."""
+
+    def __init__(self, tail, detector, sinks, poll_seconds=DEFAULT_POLL_SECONDS):
+        self.tail = tail
+        self.detector = detector
+        self.sinks = sinks
+        self.poll_seconds = poll_seconds
+        self.queue = asyncio.Queue()
+        self.latency = {sink.name: LatencyStats() for sink in sinks}
+
+    async def watch(self):
+        """Productor: lee filas nuevas y encola las transiciones confirmadas."""
+        self.detector.seed(await asyncio.to_thread(self.tail.seed))
+        while True:
+            nuevas = await asyncio.to_thread(self.tail.read_new)
+            if len(nuevas):
+                # Llegada = última escritura del archivo, no el momento del sondeo
+                for evento in self.detector.feed(nuevas, arrival=self.tail.mtime):
+                    await self.queue.put(evento)
+            await asyncio.sleep(self.poll_seconds)
+
+    async def _deliver(self, sink, evento, llegada):
+        try:
+            await sink.send(evento)
+        except Exception as e:
+            logger.error("Error notificando por %s: %s", sink.name, e)
+            return
+        self.latency[sink.name].record(time.time() - llegada)
+
+    async def dispatch(self):
+        """Consumidor: reparte cada evento a todos los sinks en paralelo."""
+        while True:
+            evento = await self.queue.get()
+            llegada = evento.pop('_llegada')
+            await asyncio.gather(*(self._deliver(sink, evento, llegada) for sink in self.sinks))
+            logger.info("Alerta %s=%s (%s)", evento['senal'], evento['estado_alerta'], evento['timestamp'])
+            self.queue.task_done()
+
+    async def report(self, every_seconds=60):
+        while True:
+            await asyncio.sleep(every_seconds)
+            for name, stats in self.latency.items():
+                logger.info("Latencia %s: %s", name, stats.summary())
+
+    async def run(self):
+        try:
+            await asyncio.gather(self.watch(), self.dispatch(), self.report())
+        finally:
+            for sink in self.sinks:
+                sink.close()
+
+
+def serve_webhook_standin(port):
+    """Receptor HTTP local que imprime los webhooks recibidos."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            print(body.decode('utf-8'), flush=True)
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    print(f"Receptor de webhooks en http://127.0.0.1:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Despachador de alertas de flood en segundo plano.")
+    parser.add_argument('--input', default=None, help="CSV de predicciones (por defecto, el que usa el dashboard)")
+    parser.add_argument('--sink', action='append', default=[],
+                        help="file:ruta, webhook:url, syslog o syslog:host:puerto (repetible)")
+    parser.add_argument('--prob-threshold', type=float, default=0.6)
+    parser.add_argument('--flood-threshold', type=int, default=225)
+    parser.add_argument('--debounce', type=int, default=DEFAULT_DEBOUNCE_ROWS,
+                        help="Filas consecutivas necesarias para confirmar un cambio")
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_SECONDS, help="Segundos entre lecturas")
+    parser.add_argument('--receptor', type=int, default=None, metavar='PUERTO',
+                        help="Sólo levantar el receptor local de webhooks")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    if args.receptor is not None:
+        serve_webhook_standin(args.receptor)
+        return
+
+    path = args.input or find_data_path()
+    if path is None:
+        parser.error("No se encontró el archivo de datos; indicar --input")
+    sinks = [parse_sink(spec) for spec in (args.sink or ['file:alertas.ndjson'])]
+
+    dispatcher = AlertDispatcher(
+        CsvTail(path),
+        TransitionDetector(args.prob_threshold, args.flood_threshold, args.debounce),
+        sinks,
+        poll_seconds=args.interval,
+    )
+    try:
+        asyncio.run(dispatcher.run())
+    except KeyboardInterrupt:
+        for name, stats in dispatcher.latency.items():
+            print(f"Latencia {name}: {stats.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Capa HTTP/JSON del dashboard.
+
+Expone para el front-end web los mismos cálculos que muestra Streamlit:
+
+    GET /api/status?prob_threshold=0.6&flood_threshold=225
+    GET /api/calibration?bins=10&flood_threshold=225
+
+Uso:
+
+    python -m dashboard.api --port 8600
+"""
+
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from dashboard import cards
+from dashboard.calibration import DEFAULT_BINS, compute_calibration
+from dashboard.stores import make_snapshot_store
+
+# Mismo origen que el dashboard (snapshot compartido o memoria acotada incluidos)
+_store = make_snapshot_store()
+_calibration_cache = {}
+CALIBRATION_CACHE_SIZE = 32
+
+
+def current_snapshot():
+    """Último snapshot de datos (refrescado en segundo plano)."""
+    return _store.start().latest()
+
+
+def status_payload(df, prob_threshold=0.6, flood_threshold=225):
+    """Estado actual del sistema (último registro) con las tarjetas HTML."""
+    if len(df) == 0:
+        return None
+    ultimo = df.iloc[-1]
+    prediccion = bool(ultimo['probabilidad_flood'] >= prob_threshold)
+    flood = bool(ultimo['active_alarms'] >= flood_threshold)
+    riesgo, _ = cards.risk_level(ultimo['probabilidad_flood'])
+    return {
+        'timestamp': ultimo['timestamp'].isoformat(),
+        'active_alarms': int(ultimo['active_alarms']),
+        'probabilidad_flood': float(ultimo['probabilidad_flood']),
+        'prediccion_flood': int(prediccion),
+        'flood_actual': int(flood),
+        'estado_alerta': 'ALERTA' if prediccion else 'NORMAL',
+        'nivel_riesgo': riesgo,
+        'html': {
+            'estado': cards.status_card(prediccion),
+            'probabilidad': cards.probability_card(ultimo['probabilidad_flood']),
+            'alarmas': cards.alarms_card(ultimo['active_alarms']),
+        },
+    }
+
+
+def calibration_payload(snapshot, flood_threshold=225, n_bins=DEFAULT_BINS):
+    """Calibración serializable, cacheada por versión de datos."""
+    key = (snapshot.version, flood_threshold, n_bins)
+    payload = _calibration_cache.get(key)
+    if payload is None:
+        df = snapshot.df
+        flood_actual = df['active_alarms'].to_numpy() >= flood_threshold
+        payload = compute_calibration(df['probabilidad_flood'].to_numpy(), flood_actual, n_bins).to_dict()
+        if len(_calibration_cache) >= CALIBRATION_CACHE_SIZE:
+            _calibration_cache.clear()
+        _calibration_cache[key] = payload
+    return payload
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Handler de las rutas `/api/*`."""
+
+    def _param(self, query, name, cast, default):
+        values = query.get(name)
+        return cast(values[0]) if values else default
+
+    def _send_json(self, code, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        try:
+            prob_threshold = self._param(query, 'prob_threshold', float, 0.6)
+            flood_threshold = self._param(query, 'flood_threshold', int, 225)
+            n_bins = self._param(query, 'bins', int, DEFAULT_BINS)
+        except ValueError as e:
+            self._send_json(400, {'error': f"Parámetro inválido: {e}"})
+            return
+
+        snapshot = current_snapshot()
+        if snapshot is None:
+            self._send_json(503, {'error': f"Error cargando datos: {_store.error}"})
+            return
+        if url.path == '/api/status':
+            payload = status_payload(snapshot.df, prob_threshold, flood_threshold)
+            if payload is None:
+                self._send_json(404, {'error': "No hay datos disponibles"})
+                return
+        elif url.path == '/api/calibration':
+            if not 1 <= n_bins <= 100:
+                self._send_json(400, {'error': "bins debe estar entre 1 y 100"})
+                return
+            payload = calibration_payload(snapshot, flood_threshold, n_bins)
+        else:
+            self._send_json(404, {'error': "Ruta no encontrada"})
+            return
+        self._send_json(200, payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor JSON del dashboard.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), ApiHandler)
+    print(f"API escuchando en http://{args.host}:{args.port}/api/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Backfill masivo de la tabla de predicciones.
+
+Lee el historial crudo de alarmas (`ypf_alarms`) por particiones de tiempo,
+lo puntúa en paralelo y escribe en la tabla de predicciones
+(`ypf_flood_alarms`) con inserciones por lotes. Cada partición completada
+queda registrada como checkpoint en la misma transacción que sus filas, así
+que un backfill interrumpido se retoma sin duplicar ni perder datos. La
+última partición nunca se registra: puede seguir recibiendo filas, así que se
+vuelve a puntuar en cada ejecución.
+
+El stand-in local es una base SQLite con el mismo esquema que SQL Server:
+
+    python -m dashboard.backfill importar alarmas_crudas.csv
+    python -m dashboard.backfill ejecutar --workers 4
+"""
+
+import argparse
+import importlib
+import os
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+LOCAL_DB = os.path.join('data', 'ypf_local.sqlite')
+INPUT_TABLE = 'ypf_alarms'
+OUTPUT_TABLE = 'ypf_flood_alarms'
+CHECKPOINT_TABLE = 'backfill_checkpoints'
+
+DEFAULT_CHUNK_ROWS = 50_000
+DEFAULT_PARTITION = 'MS'      # una partición por mes
+WARMUP_ROWS = 48              # contexto previo para las features (24 horas)
+HORIZON_STEPS = 4             # 2 horas en intervalos de 30 minutos
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {INPUT_TABLE} (
+    timestamp TEXT PRIMARY KEY,
+    active_alarms INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS {OUTPUT_TABLE} (
+    timestamp TEXT PRIMARY KEY,
+    prediccion_flood INTEGER NOT NULL,
+    probabilidad_flood REAL NOT NULL,
+    estado_alerta TEXT NOT NULL,
+    active_actual INTEGER NOT NULL,
+    fecha_prediccion TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (
+    freq TEXT NOT NULL,
+    inicio TEXT NOT NULL,
+    fin TEXT NOT NULL,
+    filas INTEGER NOT NULL,
+    completado_en TEXT NOT NULL,
+    PRIMARY KEY (freq, inicio, fin)
+);
+"""
+
+
+def connect(db_path=LOCAL_DB):
+    """Abre la base local con el esquema creado y escrituras por lotes rápidas."""
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def import_raw_csv(csv_path, db_path=LOCAL_DB, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Carga un CSV de alarmas crudas (`timestamp`, `active_alarms`) por bloques.
+
+    Returns:
+        Cantidad de filas importadas.
+    """
+    conn = connect(db_path)
+    n_rows = 0
+    try:
+        for chunk in pd.read_csv(csv_path, usecols=['timestamp', 'active_alarms'], chunksize=chunk_rows):
+            timestamps = pd.to_datetime(chunk['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
+            rows = zip(timestamps.tolist(), chunk['active_alarms'].astype(int).tolist())
+            with conn:
+                conn.executemany(f"INSERT OR REPLACE INTO {INPUT_TABLE} VALUES (?, ?)", rows)
+            n_rows += len(chunk)
+    finally:
+        conn.close()
+    return n_rows
+
+
+# ==========================================
+# PUNTUACIÓN
+# ==========================================
+
+def baseline_scores(timestamps, active_alarms, flood_threshold=225):
+    """
+    Scorer de referencia: logística sobre nivel actual y tendencia de 2 horas.
+
+    Reemplazable con `--scorer modulo:funcion` por el modelo entrenado; la
+    función recibe los arrays de timestamps y alarmas (con las filas de
+    contexto al inicio) y devuelve una probabilidad por fila.
+    """
+    alarms = np.asarray(active_alarms, dtype=float)
+    tendencia = np.zeros_like(alarms)
+    tendencia[HORIZON_STEPS:] = alarms[HORIZON_STEPS:] - alarms[:-HORIZON_STEPS]
+    logit = (alarms + tendencia - flood_threshold) / 15.0
+    return 1.0 / (1.0 + np.exp(-logit))
+
+
+def load_scorer(spec=None):
+    """Resuelve `modulo:funcion` o devuelve el scorer de referencia."""
+    if not spec:
+        return baseline_scores
+    module, _, name = spec.partition(':')
+    return getattr(importlib.import_module(module), name)
+
+
+def partitions(db_path=LOCAL_DB, freq=DEFAULT_PARTITION):
+    """Particiones [inicio, fin) que cubren el rango de `ypf_alarms`."""
+    conn = connect(db_path)
+    try:
+        inicio, fin = conn.execute(f"SELECT MIN(timestamp), MAX(timestamp) FROM {INPUT_TABLE}").fetchone()
+    finally:
+        conn.close()
+    if inicio is None:
+        return []
+    periodo = 'M' if freq == 'MS' else 'D'
+    bordes = pd.date_range(pd.Timestamp(inicio).to_period(periodo).start_time, pd.Timestamp(fin), freq=freq)
+    bordes = bordes.append(pd.DatetimeIndex([bordes[-1] + to_offset(freq)]))
+    return [(a.strftime('%Y-%m-%d %H:%M:%S'), b.strftime('%Y-%m-%d %H:%M:%S'))
+            for a, b in zip(bordes[:-1], bordes[1:])]
+
+
+def score_partition(db_path, inicio, fin, scorer_spec=None, prob_threshold=0.6):
+    """
+    Puntúa una partición (se ejecuta en un proceso del pool).
+
+    Lee `WARMUP_ROWS` filas anteriores como contexto para las features y
+    devuelve sólo las filas de la partición, listas para `executemany`.
+    """
+    scorer = load_scorer(scorer_spec)
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    try:
+        contexto = conn.execute(
+            f"SELECT timestamp, active_alarms FROM {INPUT_TABLE} WHERE timestamp < ? "
+            f"ORDER BY timestamp DESC LIMIT ?", (inicio, WARMUP_ROWS)
+        ).fetchall()[::-1]
+        filas = conn.execute(
+            f"SELECT timestamp, active_alarms FROM {INPUT_TABLE} WHERE timestamp >= ? AND timestamp < ? "
+            f"ORDER BY timestamp", (inicio, fin)
+        ).fetchall()
+    finally:
+        conn.close()
+    if not filas:
+        return []
+
+    timestamps = np.array([r[0] for r in contexto + filas])
+    alarms = np.array([r[1] for r in contexto + filas], dtype=np.int64)
+    prob = np.asarray(scorer(timestamps, alarms), dtype=float)[len(contexto):]
+
+    ahora = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    prediccion = prob >= prob_threshold
+    return list(zip(
+        timestamps[len(contexto):].tolist(),
+        prediccion.astype(int).tolist(),
+        prob.tolist(),
+        np.where(prediccion, 'ALERTA', 'NORMAL').tolist(),
+        alarms[len(contexto):].tolist(),
+        [ahora] * len(filas),
+    ))
+
+
+def write_partition(conn, freq, particion, rows, checkpoint=True, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Inserta las filas por lotes y registra el checkpoint en la misma transacción.
+
+    Args:
+        freq: Tamaño de partición (forma parte de la clave del checkpoint).
+        particion: Tupla (inicio, fin).
+        checkpoint: False para la última partición, que sigue abierta.
+    """
+    with conn:
+        for start in range(0, len(rows), chunk_rows):
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {OUTPUT_TABLE} VALUES (?, ?, ?, ?, ?, ?)",
+                rows[start:start + chunk_rows]
+            )
+        if checkpoint:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {CHECKPOINT_TABLE} VALUES (?, ?, ?, ?, ?)",
+                (freq, *particion, len(rows), datetime.now().isoformat(timespec='seconds'))
+            )
+
+
+def run_backfill(db_path=LOCAL_DB, workers=None, scorer_spec=None, prob_threshold=0.6,
+                 freq=DEFAULT_PARTITION, restart=False, progress=print):
+    """
+    Ejecuta el backfill completo.
+
+    Las particiones se puntúan en paralelo en un pool de procesos; las
+    escrituras se hacen en el proceso principal (SQLite admite un solo
+    escritor) a medida que cada partición termina.
+
+    Returns:
+        dict con particiones procesadas, omitidas (ya completas) y filas escritas.
+    """
+    conn = connect(db_path)
+    try:
+        if restart:
+            with conn:
+                conn.execute(f"DELETE FROM {CHECKPOINT_TABLE}")
+        completas = set(conn.execute(
+            f"SELECT inicio, fin FROM {CHECKPOINT_TABLE} WHERE freq = ?", (freq,)
+        ))
+        particiones = partitions(db_path, freq)
+        pendientes = [p for p in particiones if p not in completas]
+        # La última partición queda abierta a filas nuevas: nunca se registra
+        abierta = particiones[-1] if particiones else None
+
+        resumen = {'procesadas': 0, 'omitidas': len(particiones) - len(pendientes), 'filas': 0}
+        inicio = time.perf_counter()
+        workers = workers or os.cpu_count() or 1
+        cola = iter(pendientes)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Ventana acotada de particiones en vuelo: la memoria no crece con el historial
+            en_vuelo = {}
+            while True:
+                while len(en_vuelo) < workers * 2:
+                    siguiente = next(cola, None)
+                    if siguiente is None:
+                        break
+                    a, b = siguiente
+                    en_vuelo[pool.submit(score_partition, db_path, a, b, scorer_spec, prob_threshold)] = siguiente
+                if not en_vuelo:
+                    break
+                listos, _ = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                for future in listos:
+                    particion = en_vuelo.pop(future)
+                    rows = future.result()
+                    write_partition(conn, freq, particion, rows, checkpoint=particion != abierta)
+                    resumen['procesadas'] += 1
+                    resumen['filas'] += len(rows)
+                    progress(f"[{resumen['procesadas']}/{len(pendientes)}] {particion[0]}: {len(rows):,} filas")
+        resumen['segundos'] = time.perf_counter() - inicio
+        return resumen
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill de la tabla de predicciones de flood.")
+    parser.add_argument('--db', default=LOCAL_DB, help="Base SQLite local (stand-in de SQL Server)")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    importar = sub.add_parser('importar', help="Importa un CSV de alarmas crudas a ypf_alarms")
+    importar.add_argument('csv')
+    importar.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+
+    ejecutar = sub.add_parser('ejecutar', help="Puntúa ypf_alarms y escribe ypf_flood_alarms")
+    ejecutar.add_argument('--workers', type=int, default=None, help="Procesos (por defecto, uno por núcleo)")
+    ejecutar.add_argument('--scorer', default=None, help="Función de puntuación modulo:funcion")
+    ejecutar.add_argument('--prob-threshold', type=float, default=0.6)
+    ejecutar.add_argument('--particion', choices=['MS', 'D'], default=DEFAULT_PARTITION,
+                          help="Tamaño de partición: mes (MS) o día (D)")
+    ejecutar.add_argument('--reiniciar', action='store_true', help="Ignora los checkpoints existentes")
+
+    args = parser.parse_args()
+    if args.comando == 'importar':
+        n_rows = import_raw_csv(args.csv, args.db, args.chunk_rows)
+        print(f"{n_rows:,} filas importadas en {INPUT_TABLE}")
+    else:
+        resumen = run_backfill(args.db, args.workers, args.scorer, args.prob_threshold,
+                               args.particion, args.reiniciar)
+        print(f"{resumen['filas']:,} filas en {resumen['procesadas']} particiones "
+              f"({resumen['omitidas']} ya completas) en {resumen['segundos']:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Calibración del modelo (diagrama de confiabilidad).
+
+Agrupa las predicciones en bins de probabilidad y compara la probabilidad
+media de cada bin con la frecuencia observada de `flood_actual`. Todos los
+estadísticos salen de una sola pasada de `bincount` sobre los índices de bin.
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BINS = 10
+
+
+class Calibration:
+    """Resultado de la calibración: tabla por bin, Brier score y ECE."""
+
+    def __init__(self, bins, brier, ece, n):
+        self.bins = bins
+        self.brier = brier
+        self.ece = ece
+        self.n = n
+
+    def to_dict(self):
+        """Representación serializable a JSON."""
+        bins = self.bins.astype(object).where(self.bins.notna(), None)
+        return {
+            'n': self.n,
+            'brier': self.brier,
+            'ece': self.ece,
+            'bins': bins.to_dict(orient='records'),
+        }
+
+
+def compute_calibration(probabilidad, flood_actual, n_bins=DEFAULT_BINS):
+    """
+    Calcula la tabla de calibración.
+
+    Args:
+        probabilidad: Probabilidades predichas (0-1).
+        flood_actual: Resultado observado (0/1).
+        n_bins: Cantidad de bins de igual ancho.
+
+    Returns:
+        Calibration con columnas `bin_inicio`, `bin_fin`, `n`, `prob_media`
+        y `frecuencia_observada` por bin.
+    """
+    prob = np.asarray(probabilidad, dtype=float)
+    real = np.asarray(flood_actual, dtype=float)
+    n = len(prob)
+
+    idx = np.clip((prob * n_bins).astype(np.intp), 0, n_bins - 1)
+    counts = np.bincount(idx, minlength=n_bins)
+    prob_sum = np.bincount(idx, weights=prob, minlength=n_bins)
+    real_sum = np.bincount(idx, weights=real, minlength=n_bins)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        prob_media = np.where(counts > 0, prob_sum / counts, np.nan)
+        frecuencia = np.where(counts > 0, real_sum / counts, np.nan)
+
+    edges = np.arange(n_bins + 1) / n_bins
+    bins = pd.DataFrame({
+        'bin_inicio': edges[:-1],
+        'bin_fin': edges[1:],
+        'n': counts,
+        'prob_media': prob_media,
+        'frecuencia_observada': frecuencia,
+    })
+
+    brier = float(np.mean((prob - real) ** 2)) if n else float('nan')
+    ece = float(np.abs(prob_sum - real_sum).sum() / n) if n else float('nan')
+    return Calibration(bins, brier, ece, n)
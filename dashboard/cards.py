@@ -0,0 +1,199 @@
+"""
+Tarjetas HTML del dashboard.
+
+Las plantillas se compilan una sola vez al importar el módulo y la salida se
+memoriza sobre los valores que efectivamente se muestran (texto formateado de
+la probabilidad, cantidad de alarmas, color de riesgo, hora). Un rerun que no
+cambia lo que ve el operador devuelve exactamente el mismo string cacheado.
+
+Usado por `app.py` y por las páginas de documentación en `pages/`.
+"""
+
+from functools import lru_cache
+from textwrap import dedent
+
+# Paleta
+COLOR_ALERTA = "#DC143C"
+COLOR_ADVERTENCIA = "#FFA500"
+COLOR_OK = "#3DCD58"
+COLOR_PRIMARIO = "#2E9A42"
+COLOR_TEXTO = "#333333"
+
+CACHE_SIZE = 256
+
+
+def _compile(template):
+    """Normaliza la plantilla y devuelve su método `format` ligado."""
+    return dedent(template).strip().format
+
+
+_STATUS_CARD = _compile("""
+    <div style='background-color: {color}; color: white; padding: 2rem; border-radius: 12px; text-align: center;'>
+        <h1 style='color: white; margin: 0; font-size: 3rem;'>{titulo}</h1>
+        <p style='font-size: 1.2rem; margin-top: 1rem;'>{mensaje}</p>
+    </div>
+""")
+
+_METRIC_CARD = _compile("""
+    <div style='background-color: #FFFFFF; padding: 1.5rem; border-radius: 12px; border: 2px solid #E5E5E5; text-align: center;'>
+        <div style='color: #333333; font-size: 0.9rem; margin-bottom: 0.5rem;'>{titulo}</div>
+        <div style='color: #2E9A42; font-size: 3rem; font-weight: 700;'>{valor}</div>
+        <div style='color: #666666; font-size: 0.8rem; margin-top: 0.5rem;'>{contexto}</div>
+    </div>
+""")
+
+_INFO_CARD = _compile("""
+    <div style='background-color: #FFFFFF; padding: 1rem; border-radius: 8px; border-left: 4px solid {borde};'>
+        <div style='color: #666666; font-size: 0.85rem;'>{titulo}</div>
+        <div style='color: {color}; font-size: 1.1rem; font-weight: 600; margin-top: 0.5rem;'>
+            {valor}
+        </div>{detalle}
+    </div>
+""")
+
+_INFO_DETAIL = _compile("""
+    <div style='color: #666666; font-size: 0.8rem; margin-top: 0.2rem;'>
+        {texto}
+    </div>
+""")
+
+_CONFUSION_TABLE = _compile("""
+    <table style='width: 100%; border-collapse: collapse;'>
+        <tr style='background-color: #2E9A42; color: white;'>
+            <th style='padding: 0.5rem;'></th>
+            <th style='padding: 0.5rem;'>Pred No Flood</th>
+            <th style='padding: 0.5rem;'>Pred Flood</th>
+        </tr>
+        <tr>
+            <td style='background-color: #F5F5F5; font-weight: 600; padding: 0.5rem;'>Real No Flood</td>
+            <td style='padding: 0.5rem; text-align: center;'>{tn:,}</td>
+            <td style='padding: 0.5rem; text-align: center; color: #DC143C;'>{fp:,}</td>
+        </tr>
+        <tr>
+            <td style='background-color: #F5F5F5; font-weight: 600; padding: 0.5rem;'>Real Flood</td>
+            <td style='padding: 0.5rem; text-align: center; color: #DC143C;'>{fn:,}</td>
+            <td style='padding: 0.5rem; text-align: center; color: #2E9A42; font-weight: 600;'>{tp:,}</td>
+        </tr>
+    </table>
+""")
+
+# Tarjetas sin partes variables: se renderizan una vez al importar
+STATUS_ALERTA = _STATUS_CARD(
+    color=COLOR_ALERTA,
+    titulo="ALERTA DE FLOOD",
+    mensaje="Se predice flood de alarmas en las próximas 2 horas",
+)
+STATUS_NORMAL = _STATUS_CARD(
+    color=COLOR_OK,
+    titulo="ESTADO NORMAL",
+    mensaje="No se predice flood en las próximas 2 horas",
+)
+FOOTER = dedent("""
+    <div style='text-align: center; color: #666666; padding: 1rem; font-size: 0.85rem;'>
+        Sistema de Predicción de Flood de Alarmas - Horizonte: 2 horas | Modelo Base (XGBoost)
+    </div>
+""").strip()
+
+
+def risk_level(prob):
+    """Devuelve (nivel, color) según la probabilidad de flood."""
+    if prob >= 0.7:
+        return "ALTO", COLOR_ALERTA
+    if prob >= 0.4:
+        return "MEDIO", COLOR_ADVERTENCIA
+    return "BAJO", COLOR_OK
+
+
+def status_card(prediccion_flood):
+    """Tarjeta de estado principal (ALERTA / NORMAL)."""
+    return STATUS_ALERTA if prediccion_flood else STATUS_NORMAL
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def metric_card(titulo, valor, contexto):
+    """Tarjeta de métrica con número destacado."""
+    return _METRIC_CARD(titulo=titulo, valor=valor, contexto=contexto)
+
+
+def probability_card(probabilidad):
+    """Tarjeta de probabilidad de flood; cachea sobre el porcentaje mostrado."""
+    return metric_card("PROBABILIDAD DE FLOOD", f"{probabilidad * 100:.1f}%", "Próximas 2 horas")
+
+
+def alarms_card(active_alarms):
+    """Tarjeta de alarmas activas."""
+    return metric_card("ALARMAS ACTIVAS", str(int(active_alarms)), "En este momento")
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def info_card(titulo, valor, color=COLOR_TEXTO, borde=None, detalle=None):
+    """Tarjeta informativa con borde lateral de color."""
+    return _INFO_CARD(
+        titulo=titulo,
+        valor=valor,
+        color=color,
+        borde=borde or color,
+        detalle="\n" + _INFO_DETAIL(texto=detalle) if detalle else "",
+    )
+
+
+def format_age(seconds):
+    """Antigüedad legible y de baja resolución (mantiene efectivo el cache)."""
+    if seconds < 60:
+        return f"hace {int(seconds) // 10 * 10} s"
+    if seconds < 3600:
+        return f"hace {int(seconds // 60)} min"
+    return f"hace {int(seconds // 3600)} h"
+
+
+def round_age(seconds):
+    """Redondea la antigüedad a la resolución de `format_age` (clave estable)."""
+    if seconds is None:
+        return None
+    if seconds < 60:
+        return int(seconds) // 10 * 10
+    if seconds < 3600:
+        return int(seconds // 60) * 60
+    return int(seconds // 3600) * 3600
+
+
+def timestamp_card(timestamp, edad_segundos=None):
+    """
+    Tarjeta de última actualización; cachea sobre la hora mostrada.
+
+    Si se indica `edad_segundos`, agrega la antigüedad de los datos (desde
+    la última modificación del origen).
+    """
+    detalle = timestamp.strftime('%d/%m/%Y')
+    if edad_segundos is not None:
+        detalle += f" · datos {format_age(edad_segundos)}"
+    return info_card(
+        "Última actualización",
+        timestamp.strftime('%H:%M:%S'),
+        borde=COLOR_OK,
+        detalle=detalle,
+    )
+
+
+def risk_card(probabilidad):
+    """Tarjeta de nivel de riesgo."""
+    riesgo, color = risk_level(probabilidad)
+    return info_card("Nivel de Riesgo", riesgo, color=color)
+
+
+def flood_actual_card(flood_actual):
+    """Tarjeta de flood actual (SÍ / NO)."""
+    if flood_actual:
+        return info_card("Flood Actual", "SÍ", color=COLOR_ALERTA)
+    return info_card("Flood Actual", "NO", color=COLOR_OK)
+
+
+def next_flood_card(tiempo_texto):
+    """Tarjeta de tiempo hasta el próximo flood."""
+    return info_card("Próximo Flood", tiempo_texto, borde=COLOR_PRIMARIO)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def confusion_matrix_table(tn, fp, fn, tp):
+    """Tabla HTML de la matriz de confusión."""
+    return _CONFUSION_TABLE(tn=int(tn), fp=int(fp), fn=int(fn), tp=int(tp))
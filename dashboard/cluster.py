@@ -0,0 +1,137 @@
+"""
+Modo de despliegue multi-proceso.
+
+Un proceso de Streamlit es un solo intérprete de Python, así que el GIL lo
+limita a un núcleo. Este lanzador:
+
+1. Publica el snapshot de datos en un directorio compartido (`dashboard.shm`);
+   es el único proceso que lee el archivo de predicciones.
+2. Arranca N workers `streamlit run app.py`, cada uno en su puerto local, que
+   leen el snapshot mapeado en memoria sin copiarlo.
+3. Atiende el puerto público con un balanceador TCP que asigna cada cliente
+   a un worker según su IP. La asignación es fija: la sesión de Streamlit
+   (websocket y recursos) queda siempre en el mismo worker.
+
+Uso:
+    python -m dashboard.cluster --workers 4 --port 8501
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import subprocess
+import sys
+import zlib
+
+from dashboard.shm import DEFAULT_SHARED_DIR, SnapshotPublisher
+from dashboard.snapshot import DEFAULT_REFRESH_SECONDS
+from dashboard.stores import configured_loader
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT_DIR, 'app.py')
+DEFAULT_PORT = 8501
+DEFAULT_WORKER_PORT = 8700
+PIPE_BYTES = 64 * 1024
+
+
+def start_worker(port, shared_dir):
+    """Lanza un worker de Streamlit que lee el snapshot compartido."""
+    env = dict(os.environ, FLOOD_SHARED_SNAPSHOT_DIR=os.path.abspath(shared_dir))
+    cmd = [
+        sys.executable, '-m', 'streamlit', 'run', APP_PATH,
+        '--server.port', str(port),
+        '--server.address', '127.0.0.1',
+        '--server.headless', 'true',
+    ]
+    return subprocess.Popen(cmd, cwd=ROOT_DIR, env=env)
+
+
+async def _pipe(reader, writer):
+    try:
+        while True:
+            data = await reader.read(PIPE_BYTES)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+class StickyBalancer:
+    """
+    Balanceador TCP con afinidad por IP del cliente.
+
+    Si el worker asignado no responde, prueba con los siguientes en orden.
+    """
+
+    def __init__(self, backends):
+        self.backends = backends
+
+    def pick(self, client_ip):
+        """Orden de workers a probar para una IP (el primero es el asignado)."""
+        start = zlib.crc32(client_ip.encode()) % len(self.backends)
+        return self.backends[start:] + self.backends[:start]
+
+    async def handle(self, client_reader, client_writer):
+        client_ip = client_writer.get_extra_info('peername')[0]
+        for host, port in self.pick(client_ip):
+            try:
+                backend_reader, backend_writer = await asyncio.open_connection(host, port)
+            except OSError:
+                continue
+            await asyncio.gather(
+                _pipe(client_reader, backend_writer),
+                _pipe(backend_reader, client_writer),
+            )
+            return
+        logger.error("Ningún worker disponible para %s", client_ip)
+        client_writer.close()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard con varios workers de Streamlit.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--worker-port', type=int, default=DEFAULT_WORKER_PORT,
+                        help="Puerto del primer worker (los siguientes son consecutivos)")
+    parser.add_argument('--dir', default=DEFAULT_SHARED_DIR, help="Directorio del snapshot compartido")
+    parser.add_argument('--refresh', type=float, default=DEFAULT_REFRESH_SECONDS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    # Mismo loader que el modo de un solo proceso (incluida la memoria acotada)
+    publisher = SnapshotPublisher(args.dir, configured_loader(shared=False), args.refresh).start()
+
+    ports = [args.worker_port + i for i in range(args.workers)]
+    workers = [start_worker(port, args.dir) for port in ports]
+    balancer = StickyBalancer([('127.0.0.1', port) for port in ports])
+    # Un SIGTERM del supervisor también baja los workers
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"{args.workers} workers detrás de http://{args.host}:{args.port} (snapshot en {args.dir})")
+    try:
+        asyncio.run(balancer.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.stop()
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.wait()
+
+
+if __name__ == "__main__":
+    main()
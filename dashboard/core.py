@@ -0,0 +1,158 @@
+"""
+Cálculos compartidos por `app.py` y las páginas de documentación.
+
+Estado actual, tiempo hasta el próximo flood, tarjetas y gráfico de tendencia
+se calculan aquí una sola vez; `dashboard.live` los cachea por versión del
+snapshot para que cambiar de página sólo cueste el render.
+"""
+
+import plotly.graph_objects as go
+
+from dashboard import cards
+
+
+def get_current_status(df, prob_threshold=0.6, flood_threshold=225):
+    """
+    Obtiene el estado actual del sistema (último registro).
+    """
+    if len(df) == 0:
+        return None
+    
+    # Último registro
+    ultimo = df.iloc[-1].copy()
+    
+    # Recalcular predicción y flood actual
+    ultimo['prediccion_flood'] = 1 if ultimo['probabilidad_flood'] >= prob_threshold else 0
+    ultimo['flood_actual'] = 1 if ultimo['active_alarms'] >= flood_threshold else 0
+    
+    return ultimo
+
+
+def plot_simple_trend(ventana, flood_threshold=225):
+    """
+    Gráfico simple de tendencia de una ventana de tiempo.
+    
+    `ventana` es un `dashboard.gaps.TrendWindow`: las series traen un punto
+    vacío en cada hueco, así que la línea se corta en lugar de unir el corte.
+    """
+    fig = go.Figure()
+    
+    # Línea de alarmas activas
+    fig.add_trace(go.Scatter(
+        x=ventana.x,
+        y=ventana.alarmas,
+        mode='lines',
+        connectgaps=False,
+        name='Alarmas Activas',
+        line=dict(color='#3DCD58', width=3),
+        fill='tozeroy',
+        fillcolor='rgba(61, 205, 88, 0.1)',
+        hovertemplate='%{x}<br>Alarmas: %{y}<extra></extra>'
+    ))
+    
+    # Umbral de flood
+    fig.add_hline(
+        y=flood_threshold,
+        line_dash="dash",
+        line_color="#DC143C",
+        line_width=2,
+        annotation_text=f"Umbral: {flood_threshold}",
+        annotation_position="right"
+    )
+    
+    # Probabilidad de flood (eje secundario)
+    fig.add_trace(go.Scatter(
+        x=ventana.x,
+        y=ventana.probabilidad * 100,
+        mode='lines',
+        connectgaps=False,
+        name='Probabilidad Flood (%)',
+        line=dict(color='#2E9A42', width=2, dash='dot'),
+        yaxis='y2',
+        hovertemplate='%{x}<br>Probabilidad: %{y:.1f}%<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        xaxis_title='Tiempo',
+        # El eje cubre la ventana pedida aunque falten datos al comienzo
+        xaxis=dict(range=[ventana.inicio, ventana.fin]) if ventana.fin is not None else {},
+        yaxis_title='Alarmas Activas',
+        yaxis2=dict(
+            title='Probabilidad Flood (%)',
+            overlaying='y',
+            side='right',
+            range=[0, 100]
+        ),
+        hovermode='x unified',
+        template='plotly_white',
+        height=400,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        margin=dict(l=50, r=50, t=20, b=50),
+        plot_bgcolor='#FFFFFF',
+        paper_bgcolor='#FFFFFF'
+    )
+    
+    return fig
+
+
+def completeness_text(ventana):
+    """
+    Resumen de completitud de datos de la ventana del gráfico.
+    """
+    if ventana.fin is None:
+        return "Sin datos en la ventana"
+    texto = f"Completitud de datos: {ventana.completitud:.1f}% ({ventana.presentes} de {ventana.esperados} intervalos)"
+    if ventana.huecos:
+        texto += f" · {len(ventana.huecos)} hueco(s) en la ventana"
+    return texto
+
+
+def next_flood_text(df, estado, prob_threshold=0.6):
+    """
+    Tiempo hasta el próximo flood (si se predice).
+    """
+    if estado['prediccion_flood'] == 1:
+        return "Inminente"
+    
+    # Buscar próxima predicción de flood
+    inicio = df['timestamp'].searchsorted(estado['timestamp'], side='right')
+    futuras = df.iloc[inicio:]
+    futuras_flood = futuras[futuras['probabilidad_flood'] >= prob_threshold]
+    if len(futuras_flood) > 0:
+        tiempo_dif = futuras_flood.iloc[0]['timestamp'] - estado['timestamp']
+        horas = tiempo_dif.total_seconds() / 3600
+        return f"{horas:.1f} horas"
+    return "No previsto"
+
+
+def status_view(df, prob_threshold=0.6, flood_threshold=225):
+    """
+    Estado actual con todas sus tarjetas HTML listas para renderizar.
+    
+    Returns:
+        dict con `estado` (último registro recalculado), `tiempo_texto` y
+        `tarjetas` (HTML por tarjeta), o None si no hay datos.
+    """
+    estado = get_current_status(df, prob_threshold, flood_threshold)
+    if estado is None:
+        return None
+    
+    tiempo_texto = next_flood_text(df, estado, prob_threshold)
+    return {
+        'estado': estado,
+        'tiempo_texto': tiempo_texto,
+        'tarjetas': {
+            'estado': cards.status_card(estado['prediccion_flood'] == 1),
+            'probabilidad': cards.probability_card(estado['probabilidad_flood']),
+            'alarmas': cards.alarms_card(estado['active_alarms']),
+            'riesgo': cards.risk_card(estado['probabilidad_flood']),
+            'flood_actual': cards.flood_actual_card(estado['flood_actual'] == 1),
+            'proximo_flood': cards.next_flood_card(tiempo_texto),
+        },
+    }
@@ -0,0 +1,124 @@
+"""
+Acceso a los datos de predicción.
+
+Centraliza dónde se busca `salida_predicciones.csv`, cómo se lee (completo o
+por bloques) y cómo se recalculan las columnas que dependen de los umbrales.
+"""
+
+import io
+import os
+
+import pandas as pd
+
+# Ubicaciones posibles del archivo de predicciones, en orden de prioridad
+DATA_PATHS = [
+    'prueba/salida_predicciones.csv',
+    'salida_predicciones.csv',
+    'data/salida_predicciones.csv'
+]
+
+COLUMNS = ['timestamp', 'active_alarms', 'probabilidad_flood', 'prediccion_flood', 'flood_actual']
+
+DEFAULT_CHUNK_ROWS = 100_000
+DEFAULT_BLOCK_BYTES = 8 * 1024 * 1024
+
+
+def find_data_path(paths=DATA_PATHS):
+    """
+    Devuelve la primera ruta existente o None.
+
+    `FLOOD_DATA_PATH` reemplaza la lista de ubicaciones (por ejemplo, para el
+    modo replay de `dashboard.replay`).
+    """
+    override = os.environ.get('FLOOD_DATA_PATH')
+    if override:
+        paths = [override]
+    for path in paths:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def data_version(path):
+    """Identificador de versión del archivo (ruta, tamaño, fecha de modificación)."""
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+def read_history(path):
+    """Lee el historial completo ordenado por timestamp."""
+    df = pd.read_csv(path)
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df.sort_values('timestamp').reset_index(drop=True)
+
+
+def iter_history(path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Lee el historial por bloques de `chunk_rows` filas.
+
+    Asume que el archivo ya está ordenado por timestamp (como lo escribe el
+    modelo); no carga nunca el archivo completo en memoria.
+    """
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        chunk['timestamp'] = pd.to_datetime(chunk['timestamp'])
+        yield chunk
+
+
+def iter_frame(df, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Recorre un DataFrame ya cargado en bloques (vistas, sin copiar)."""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def apply_thresholds(df, prob_threshold=0.6, flood_threshold=225):
+    """Devuelve una copia con `prediccion_flood` y `flood_actual` recalculados."""
+    return df.assign(
+        prediccion_flood=(df['probabilidad_flood'] >= prob_threshold).astype(int),
+        flood_actual=(df['active_alarms'] >= flood_threshold).astype(int),
+    )
+
+
+def read_header(path):
+    """Devuelve (columnas, offset del primer byte de datos) del CSV."""
+    with open(path, 'rb') as f:
+        header = f.readline()
+    return header.decode('utf-8').strip().split(','), len(header)
+
+
+def iter_csv_blocks(path, start=None, end=None, block_bytes=DEFAULT_BLOCK_BYTES):
+    """
+    Lee el rango de bytes [start, end) del CSV en bloques cortados en fin de línea.
+
+    Permite retomar la lectura exactamente donde quedó (archivos de sólo
+    agregado) sin volver a recorrer el principio. Una última línea sin salto
+    de línea final se entrega igual al llegar a `end`; si el archivo se achica
+    durante la lectura, se corta en lo que se pudo leer.
+
+    Yields:
+        (DataFrame del bloque, offset siguiente al último byte leído)
+    """
+    columnas, data_start = read_header(path)
+    offset = data_start if start is None else start
+
+    def parse(bloque):
+        df = pd.read_csv(io.BytesIO(bloque), names=columnas, header=None)
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        return df
+
+    with open(path, 'rb') as f:
+        end = os.fstat(f.fileno()).st_size if end is None else end
+        f.seek(offset)
+        resto = b''
+        while offset + len(resto) < end:
+            leido = f.read(min(block_bytes, end - offset - len(resto)))
+            if not leido:
+                break
+            resto += leido
+            corte = resto.rfind(b'\n') + 1
+            if corte == 0:
+                continue
+            bloque, resto = resto[:corte], resto[corte:]
+            offset += corte
+            yield parse(bloque), offset
+        if resto.strip():
+            yield parse(resto), offset + len(resto)
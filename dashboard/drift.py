@@ -0,0 +1,177 @@
+"""
+Monitor de drift del modelo con métricas por ventana.
+
+Mantiene acumuladores por día o por semana (matriz de confusión, suma de
+Brier y conteos por bin de calibración) que se actualizan de forma incremental
+a medida que llegan filas nuevas: el costo por fila es constante y nunca se
+recorre el historial ya procesado.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+WINDOW_FREQS = {'D': "Día", 'W': "Semana"}
+CALIBRATION_BINS = 10
+DEFAULT_RECALL_FLOOR = 0.6
+
+# Posiciones de los acumuladores escalares dentro del vector de cada ventana
+_TP, _FP, _FN, _TN, _BRIER = range(5)
+_N_SCALARS = 5
+
+
+def window_start(timestamps, freq='D'):
+    """Inicio de la ventana (día o semana que empieza el lunes) de cada timestamp."""
+    days = timestamps.dt.floor('D')
+    if freq == 'W':
+        return days - pd.to_timedelta(days.dt.dayofweek, unit='D')
+    return days
+
+
+class RollingMetrics:
+    """
+    Métricas por ventana actualizadas incrementalmente.
+
+    Supone historial de sólo-agregado (append-only) ordenado por timestamp.
+    La ventana puede además descartar filas viejas por el principio (modo de
+    memoria acotada) sin que se pierdan las métricas acumuladas. Si el
+    historial se reescribe, `sync` lo detecta y reinicia los acumuladores.
+    """
+
+    def __init__(self, freq='D', prob_threshold=0.6, flood_threshold=225, n_bins=CALIBRATION_BINS):
+        if freq not in WINDOW_FREQS:
+            raise ValueError(f"Frecuencia no soportada: {freq}")
+        self.freq = freq
+        self.prob_threshold = prob_threshold
+        self.flood_threshold = flood_threshold
+        self.n_bins = n_bins
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._windows = {}
+        self.n_rows = 0
+        self.first_timestamp = None
+        self.last_timestamp = None
+        # (alarmas, probabilidad) de la última fila procesada
+        self._last_values = None
+
+    def update(self, df_new):
+        """Incorpora filas nuevas (posteriores a `last_timestamp`)."""
+        if len(df_new) == 0:
+            return
+        prob = df_new['probabilidad_flood'].to_numpy(dtype=float)
+        pred = prob >= self.prob_threshold
+        real = df_new['active_alarms'].to_numpy() >= self.flood_threshold
+        bins = np.clip((prob * self.n_bins).astype(np.intp), 0, self.n_bins - 1)
+
+        codes, windows = pd.factorize(window_start(df_new['timestamp'], self.freq))
+        n_windows = len(windows)
+
+        def group_sum(weights):
+            return np.bincount(codes, weights=weights, minlength=n_windows)
+
+        def group_bins(weights=None):
+            flat = np.bincount(codes * self.n_bins + bins, weights=weights,
+                               minlength=n_windows * self.n_bins)
+            return flat.reshape(n_windows, self.n_bins)
+
+        acc = np.column_stack([
+            group_sum(pred & real),
+            group_sum(pred & ~real),
+            group_sum(~pred & real),
+            group_sum(~pred & ~real),
+            group_sum((prob - real) ** 2),
+            group_bins(),
+            group_bins(prob),
+            group_bins(real.astype(float)),
+        ])
+
+        for window, row in zip(windows, acc):
+            if window in self._windows:
+                self._windows[window] += row
+            else:
+                self._windows[window] = row
+
+        if self.first_timestamp is None:
+            self.first_timestamp = df_new['timestamp'].iloc[0]
+        self.last_timestamp = df_new['timestamp'].iloc[-1]
+        self._last_values = self._values(df_new, len(df_new) - 1)
+        self.n_rows += len(df_new)
+
+    @staticmethod
+    def _values(df, i):
+        return (int(df['active_alarms'].iloc[i]), float(df['probabilidad_flood'].iloc[i]))
+
+    def _rewritten(self, df):
+        """
+        True si `df` no continúa lo ya procesado.
+
+        Sólo se exige que la última fila procesada siga presente y sin cambios.
+        Si `df` empieza después de ella, la ventana avanzó y todas sus filas
+        son nuevas. Si termina antes, o la fila cambió, el historial se
+        reescribió.
+        """
+        ts = df['timestamp']
+        pos = ts.searchsorted(self.last_timestamp, side='left')
+        if pos == len(df):
+            return True
+        if ts.iloc[pos] != self.last_timestamp:
+            return pos > 0
+        return self._values(df, pos) != self._last_values
+
+    def sync(self, df):
+        """
+        Alinea el monitor con `df` procesando sólo las filas nuevas.
+
+        La búsqueda del punto de corte es binaria sobre los timestamps
+        ordenados, así que un rerun sin datos nuevos no cuesta nada; tampoco
+        uno en el que la ventana cruda descartó filas por el principio.
+        """
+        with self._lock:
+            if len(df) == 0:
+                return self
+            if self.last_timestamp is not None and self._rewritten(df):
+                self.reset()
+            if self.last_timestamp is None:
+                self.update(df)
+            else:
+                start = df['timestamp'].searchsorted(self.last_timestamp, side='right')
+                self.update(df.iloc[start:])
+        return self
+
+    def frame(self, recall_floor=DEFAULT_RECALL_FLOOR):
+        """
+        Métricas por ventana como DataFrame.
+
+        Columnas: `n`, `precision`, `recall`, `f1`, `brier`, `ece` y `drift`
+        (recall por debajo de `recall_floor` en ventanas con floods reales).
+        """
+        with self._lock:
+            if not self._windows:
+                return pd.DataFrame(columns=['n', 'precision', 'recall', 'f1', 'brier', 'ece', 'drift'])
+            index = sorted(self._windows)
+            acc = np.vstack([self._windows[w] for w in index])
+
+        tp, fp, fn, tn, brier_sum = (acc[:, k] for k in range(_N_SCALARS))
+        bin_n, bin_prob, bin_pos = np.split(acc[:, _N_SCALARS:], 3, axis=1)
+        n = tp + fp + fn + tn
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            precision = np.where(tp + fp > 0, tp / (tp + fp), np.nan)
+            recall = np.where(tp + fn > 0, tp / (tp + fn), np.nan)
+            f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+            f1 = np.where(np.isnan(precision) | np.isnan(recall), np.nan, f1)
+            gap = np.abs(bin_prob - bin_pos)
+            ece = gap.sum(axis=1) / n
+
+        return pd.DataFrame({
+            'n': n.astype(int),
+            'precision': precision,
+            'recall': recall,
+            'f1': f1,
+            'brier': brier_sum / n,
+            'ece': ece,
+            'drift': recall < recall_floor,
+        }, index=pd.DatetimeIndex(index, name='ventana'))
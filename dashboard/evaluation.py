@@ -0,0 +1,339 @@
+"""
+Evaluación con validación cruzada temporal en paralelo.
+
+Corre los folds de `TimeSeriesSplit` y los barridos de umbral de cada
+candidato en un pool de procesos. La matriz de features se construye una sola
+vez y se guarda en `.npy`; los procesos la abren con `mmap`, así que todos
+los candidatos la reutilizan sin copiarla ni serializarla. Cada par
+(candidato, fold) es una tarea independiente, por lo que el tiempo total
+escala casi linealmente con los núcleos.
+
+Las métricas por fold y umbral se guardan en la base local, de donde las lee
+el expander "Información Técnica del Modelo" del dashboard.
+
+Uso:
+
+    python -m dashboard.evaluation --modelo random_forest --candidatos 10 --folds 5 --workers 8
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from dashboard.backfill import HORIZON_STEPS, INPUT_TABLE, LOCAL_DB
+
+CACHE_DIR = os.path.join('data', 'cache')
+RUNS_TABLE = 'evaluacion_runs'
+FOLDS_TABLE = 'evaluacion_folds'
+THRESHOLDS = np.round(np.arange(0.05, 1.0, 0.05), 2)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {RUNS_TABLE} (
+    run_id TEXT PRIMARY KEY,
+    creado_en TEXT NOT NULL,
+    modelo TEXT NOT NULL,
+    n_candidatos INTEGER NOT NULL,
+    n_folds INTEGER NOT NULL,
+    workers INTEGER NOT NULL,
+    segundos REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS {FOLDS_TABLE} (
+    run_id TEXT NOT NULL,
+    candidato INTEGER NOT NULL,
+    params TEXT NOT NULL,
+    fold INTEGER NOT NULL,
+    umbral REAL NOT NULL,
+    accuracy REAL NOT NULL,
+    precision REAL NOT NULL,
+    recall REAL NOT NULL,
+    f1 REAL NOT NULL,
+    n_train INTEGER NOT NULL,
+    n_test INTEGER NOT NULL,
+    segundos_fit REAL NOT NULL
+);
+"""
+
+# Espacios de búsqueda (rangos de README_OPTIMIZACION.md)
+PARAM_SPACES = {
+    'xgboost': {
+        'n_estimators': [150, 200, 250, 300],
+        'max_depth': [5, 6, 7, 8],
+        'learning_rate': [0.05, 0.1, 0.15],
+        'subsample': [0.85, 0.9, 0.95],
+        'colsample_bytree': [0.85, 0.9, 0.95],
+        'min_child_weight': [1, 2, 3],
+    },
+    'random_forest': {
+        'n_estimators': [100, 200, 300],
+        'max_depth': [10, 12, 14, 16, 18],
+        'min_samples_split': [2, 5, 10],
+        'min_samples_leaf': [1, 2, 5],
+        'max_features': ['sqrt', 'log2'],
+    },
+    'gradient_boosting': {
+        'n_estimators': [100, 200, 300],
+        'max_depth': [3, 5, 7, 9],
+        'learning_rate': [0.01, 0.05, 0.1, 0.2],
+        'subsample': [0.8, 0.9, 1.0],
+        'min_samples_leaf': [1, 2, 4],
+    },
+}
+
+
+# ==========================================
+# FEATURES
+# ==========================================
+
+def build_features(timestamps, active_alarms, flood_threshold=225):
+    """
+    Matriz de features y target para el horizonte de 2 horas.
+
+    Features: lags, diferencias, estadísticos móviles y hora del día. Target:
+    flood (alarmas >= umbral) en alguno de los próximos `HORIZON_STEPS`
+    intervalos. Se descartan las filas sin historia o sin futuro completo.
+    """
+    alarms = pd.Series(np.asarray(active_alarms, dtype=float))
+    ts = pd.DatetimeIndex(timestamps)
+    columnas = {'active_alarms': alarms}
+    for lag in (1, 2, 4, 8):
+        columnas[f'lag_{lag}'] = alarms.shift(lag)
+        columnas[f'diff_{lag}'] = alarms - alarms.shift(lag)
+    for ventana in (4, 12, 48):
+        rolling = alarms.rolling(ventana)
+        columnas[f'media_{ventana}'] = rolling.mean()
+        columnas[f'max_{ventana}'] = rolling.max()
+        columnas[f'std_{ventana}'] = rolling.std()
+    hora = ts.hour + ts.minute / 60
+    columnas['hora_sin'] = pd.Series(np.sin(2 * np.pi * hora / 24))
+    columnas['hora_cos'] = pd.Series(np.cos(2 * np.pi * hora / 24))
+    columnas['fin_de_semana'] = pd.Series((ts.dayofweek >= 5).astype(float))
+
+    futuro = alarms[::-1].rolling(HORIZON_STEPS, min_periods=HORIZON_STEPS).max()[::-1].shift(-1)
+    X = pd.DataFrame(columnas)
+    validas = X.notna().all(axis=1) & futuro.notna()
+    y = (futuro[validas] >= flood_threshold).to_numpy(dtype=np.int8)
+    return X[validas].to_numpy(dtype=np.float32), y
+
+
+def load_alarm_history(input_path=None, db_path=LOCAL_DB):
+    """Historial crudo (timestamps, alarmas) desde un CSV o la tabla `ypf_alarms`."""
+    if input_path:
+        df = pd.read_csv(input_path, usecols=['timestamp', 'active_alarms'])
+    else:
+        conn = sqlite3.connect(db_path)
+        try:
+            df = pd.read_sql_query(
+                f"SELECT timestamp, active_alarms FROM {INPUT_TABLE} ORDER BY timestamp", conn
+            )
+        finally:
+            conn.close()
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df = df.sort_values('timestamp')
+    return df['timestamp'].to_numpy(), df['active_alarms'].to_numpy()
+
+
+def cached_features(timestamps, active_alarms, flood_threshold=225, cache_dir=CACHE_DIR):
+    """
+    Construye (o reutiliza) la matriz de features en disco.
+
+    Returns:
+        (ruta_X, ruta_y): archivos `.npy` que los workers abren con mmap.
+    """
+    digest = hashlib.sha1()
+    digest.update(np.asarray(timestamps).view(np.int64).tobytes())
+    digest.update(np.asarray(active_alarms, dtype=np.int64).tobytes())
+    digest.update(str(flood_threshold).encode())
+    key = digest.hexdigest()[:16]
+
+    os.makedirs(cache_dir, exist_ok=True)
+    x_path = os.path.join(cache_dir, f'features_{key}_X.npy')
+    y_path = os.path.join(cache_dir, f'features_{key}_y.npy')
+    if not (os.path.exists(x_path) and os.path.exists(y_path)):
+        X, y = build_features(timestamps, active_alarms, flood_threshold)
+        np.save(x_path, X)
+        np.save(y_path, y)
+    return x_path, y_path
+
+
+# ==========================================
+# TAREAS
+# ==========================================
+
+def make_model(modelo, params):
+    """Instancia el estimador (xgboost es opcional)."""
+    if modelo == 'xgboost':
+        from xgboost import XGBClassifier
+        return XGBClassifier(eval_metric='logloss', n_jobs=1, **params)
+    if modelo == 'random_forest':
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(n_jobs=1, **params)
+    if modelo == 'gradient_boosting':
+        from sklearn.ensemble import GradientBoostingClassifier
+        return GradientBoostingClassifier(**params)
+    raise ValueError(f"Modelo no soportado: {modelo}")
+
+
+def threshold_sweep(y_true, prob, thresholds=THRESHOLDS):
+    """Métricas para todos los umbrales a la vez (broadcasting n × umbrales)."""
+    pred = prob[:, None] >= thresholds[None, :]
+    real = y_true.astype(bool)[:, None]
+    tp = (pred & real).sum(axis=0)
+    fp = (pred & ~real).sum(axis=0)
+    fn = (~pred & real).sum(axis=0)
+    tn = len(y_true) - tp - fp - fn
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    accuracy = (tp + tn) / max(len(y_true), 1)
+    return accuracy, precision, recall, f1
+
+
+def evaluate_fold(x_path, y_path, modelo, candidato, params, fold, train_end, test_end):
+    """
+    Entrena y evalúa un candidato en un fold (se ejecuta en un proceso del pool).
+
+    Los folds de `TimeSeriesSplit` son contiguos: train = [0, train_end),
+    test = [train_end, test_end).
+    """
+    X = np.load(x_path, mmap_mode='r')
+    y = np.load(y_path, mmap_mode='r')
+
+    inicio = time.perf_counter()
+    model = make_model(modelo, params)
+    model.fit(X[:train_end], y[:train_end])
+    segundos = time.perf_counter() - inicio
+
+    y_test = np.asarray(y[train_end:test_end])
+    prob = model.predict_proba(X[train_end:test_end])[:, 1]
+    accuracy, precision, recall, f1 = threshold_sweep(y_test, prob)
+    return [
+        (candidato, json.dumps(params), fold, float(u), float(a), float(p), float(r), float(f),
+         int(train_end), int(test_end - train_end), segundos)
+        for u, a, p, r, f in zip(THRESHOLDS, accuracy, precision, recall, f1)
+    ]
+
+
+def run_evaluation(x_path, y_path, modelo='random_forest', n_candidatos=10, n_folds=5,
+                   workers=None, seed=42, db_path=LOCAL_DB, progress=print):
+    """
+    Ejecuta todos los (candidato, fold) en paralelo y guarda las métricas.
+
+    Returns:
+        run_id de la ejecución.
+    """
+    from sklearn.model_selection import ParameterSampler, TimeSeriesSplit
+
+    n_rows = len(np.load(y_path, mmap_mode='r'))
+    folds = [(int(train[-1]) + 1, int(test[-1]) + 1)
+             for train, test in TimeSeriesSplit(n_splits=n_folds).split(np.empty((n_rows, 1)))]
+    candidatos = list(ParameterSampler(PARAM_SPACES[modelo], n_iter=n_candidatos, random_state=seed))
+    workers = workers or os.cpu_count() or 1
+
+    run_id = uuid.uuid4().hex[:12]
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    inicio = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Primero los folds más grandes: mejor balance de carga al final
+            tareas = sorted(
+                ((c, params, f, train_end, test_end)
+                 for c, params in enumerate(candidatos)
+                 for f, (train_end, test_end) in enumerate(folds)),
+                key=lambda t: -t[3]
+            )
+            futures = [
+                pool.submit(evaluate_fold, x_path, y_path, modelo, c, params, f, train_end, test_end)
+                for c, params, f, train_end, test_end in tareas
+            ]
+            for n, future in enumerate(as_completed(futures), start=1):
+                rows = future.result()
+                with conn:
+                    conn.executemany(
+                        f"INSERT INTO {FOLDS_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(run_id, *row) for row in rows]
+                    )
+                progress(f"[{n}/{len(futures)}] candidato {rows[0][0]} fold {rows[0][2]}")
+        segundos = time.perf_counter() - inicio
+        with conn:
+            conn.execute(
+                f"INSERT INTO {RUNS_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, datetime.now().isoformat(timespec='seconds'), modelo,
+                 len(candidatos), n_folds, workers, segundos)
+            )
+    finally:
+        conn.close()
+    return run_id
+
+
+def latest_results(db_path=LOCAL_DB):
+    """
+    Resultados de la última evaluación para el dashboard.
+
+    Returns:
+        (run, folds): dict con los datos de la ejecución y DataFrame por
+        fold del mejor candidato en su mejor umbral; (None, None) si no hay.
+    """
+    if not os.path.exists(db_path):
+        return None, None
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    try:
+        tablas = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        if RUNS_TABLE not in tablas:
+            return None, None
+        run = pd.read_sql_query(
+            # rowid: orden de inserción (creado_en tiene resolución de segundos)
+            f"SELECT * FROM {RUNS_TABLE} ORDER BY rowid DESC LIMIT 1", conn
+        )
+        if run.empty:
+            return None, None
+        run = run.iloc[0].to_dict()
+        metricas = pd.read_sql_query(
+            f"SELECT * FROM {FOLDS_TABLE} WHERE run_id = ?", conn, params=(run['run_id'],)
+        )
+    finally:
+        conn.close()
+
+    medias = metricas.groupby(['candidato', 'umbral'])['f1'].mean()
+    candidato, umbral = medias.idxmax()
+    mejor = metricas[(metricas['candidato'] == candidato) & (metricas['umbral'] == umbral)]
+    run.update(candidato=int(candidato), umbral=float(umbral), f1_medio=float(medias.max()),
+               params=mejor['params'].iloc[0])
+    columnas = ['fold', 'n_train', 'n_test', 'accuracy', 'precision', 'recall', 'f1', 'segundos_fit']
+    return run, mejor[columnas].sort_values('fold').reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validación cruzada temporal en paralelo.")
+    parser.add_argument('--input', default=None, help="CSV con timestamp y active_alarms (por defecto, ypf_alarms)")
+    parser.add_argument('--db', default=LOCAL_DB, help="Base local donde se guardan las métricas")
+    parser.add_argument('--modelo', choices=sorted(PARAM_SPACES), default='random_forest')
+    parser.add_argument('--candidatos', type=int, default=10)
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=None, help="Procesos (por defecto, uno por núcleo)")
+    parser.add_argument('--flood-threshold', type=int, default=225)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    timestamps, alarms = load_alarm_history(args.input, args.db)
+    x_path, y_path = cached_features(timestamps, alarms, args.flood_threshold)
+    run_id = run_evaluation(x_path, y_path, args.modelo, args.candidatos, args.folds,
+                            args.workers, args.seed, args.db)
+    run, folds = latest_results(args.db)
+    print(f"Run {run_id}: mejor candidato {run['candidato']} (umbral {run['umbral']:.2f}) "
+          f"F1 medio {run['f1_medio']:.3f} en {run['segundos']:.1f} s")
+    print(folds.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Exportación del historial de predicciones.
+
+Recorre la ventana filtrada (rango de fechas + columnas derivadas de los
+umbrales) en bloques de tamaño acotado y la codifica como CSV, Parquet o
+NDJSON. Ningún paso mantiene el resultado completo en memoria.
+
+Uso:
+
+    python -m dashboard.export --format parquet --desde 2025-01-01 --hasta 2025-03-31 \\
+        --output export.parquet
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import uuid
+
+import pandas as pd
+
+from dashboard.data import COLUMNS, DEFAULT_CHUNK_ROWS, apply_thresholds, find_data_path, iter_history
+
+FORMATS = {
+    'csv': ('.csv', 'text/csv'),
+    'parquet': ('.parquet', 'application/vnd.apache.parquet'),
+    'ndjson': ('.ndjson', 'application/x-ndjson'),
+}
+
+# Carpeta servida por Streamlit (server.enableStaticServing) en /app/static/exports/;
+# debe estar junto a app.py
+EXPORT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'exports')
+EXPORT_TTL_SECONDS = 3600
+# Streamlit no sirve archivos estáticos de más de 200 MB (MAX_APP_STATIC_FILE_SIZE):
+# las exportaciones del dashboard se parten por debajo de ese límite
+MAX_PART_BYTES = 180 * 1024 * 1024
+
+
+def iter_window(chunks, desde=None, hasta=None, prob_threshold=0.6, flood_threshold=225):
+    """
+    Filtra los bloques al rango [desde, hasta] y recalcula las columnas derivadas.
+
+    Como los bloques vienen ordenados por timestamp, la lectura se corta en
+    cuanto se supera `hasta`.
+    """
+    desde = pd.Timestamp(desde) if desde is not None else None
+    hasta = pd.Timestamp(hasta) if hasta is not None else None
+
+    for chunk in chunks:
+        ts = chunk['timestamp']
+        if hasta is not None and len(chunk) and ts.iloc[0] > hasta:
+            break
+        mask = pd.Series(True, index=chunk.index)
+        if desde is not None:
+            mask &= ts >= desde
+        if hasta is not None:
+            mask &= ts <= hasta
+        window = chunk.loc[mask, COLUMNS[:3]]
+        if len(window):
+            yield apply_thresholds(window, prob_threshold, flood_threshold)
+
+
+def _encode_text(chunks, fmt):
+    header = True
+    for chunk in chunks:
+        if fmt == 'csv':
+            text = chunk.to_csv(index=False, header=header)
+        else:
+            text = chunk.to_json(orient='records', lines=True, date_format='iso')
+            if not text.endswith('\n'):
+                text += '\n'
+        header = False
+        yield text.encode('utf-8')
+
+
+def _encode_parquet(chunks):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("La exportación a Parquet requiere pyarrow (pip install pyarrow)") from e
+
+    buffer = io.BytesIO()
+    writer = None
+    for chunk in chunks:
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(buffer, table.schema)
+        # Un row group por bloque; se vacía el buffer después de cada uno
+        writer.write_table(table)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if writer is not None:
+        writer.close()
+        yield buffer.getvalue()
+
+
+def iter_encoded(chunks, fmt='csv'):
+    """Codifica los bloques en el formato pedido y produce bytes incrementalmente."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato no soportado: {fmt} (opciones: {', '.join(FORMATS)})")
+    if fmt == 'parquet':
+        return _encode_parquet(chunks)
+    return _encode_text(chunks, fmt)
+
+
+def write_export(chunks, output, fmt='csv'):
+    """
+    Escribe la exportación en `output` (ruta o archivo binario abierto).
+
+    Returns:
+        Cantidad de filas escritas.
+    """
+    n_rows = 0
+
+    def counted(chunks):
+        nonlocal n_rows
+        for chunk in chunks:
+            n_rows += len(chunk)
+            yield chunk
+
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, 'wb') as f:
+            for data in iter_encoded(counted(chunks), fmt):
+                f.write(data)
+    else:
+        for data in iter_encoded(counted(chunks), fmt):
+            output.write(data)
+    return n_rows
+
+
+def write_parts(chunks, path_for, fmt='csv', max_bytes=MAX_PART_BYTES):
+    """
+    Escribe la exportación en partes de alrededor de `max_bytes` como máximo.
+
+    Las partes se cortan entre bloques y cada una es un archivo completo (con
+    encabezado en CSV). Se abre una parte nueva cuando la siguiente, al ritmo
+    del último bloque escrito, superaría el límite; un bloque que solo ya lo
+    supera queda en una parte propia.
+
+    Args:
+        path_for: Función `path_for(n) -> ruta` de la parte `n` (desde 1).
+
+    Returns:
+        (rutas escritas, filas escritas)
+    """
+    chunks = iter(chunks)
+    siguiente = next(chunks, None)
+    rutas = []
+    n_rows = 0
+    while siguiente is not None or not rutas:
+        path = path_for(len(rutas) + 1)
+        with open(path, 'wb') as f:
+            def parte():
+                nonlocal siguiente, n_rows
+                crecimiento = 0
+                while siguiente is not None:
+                    antes = f.tell()
+                    if antes and antes + crecimiento > max_bytes:
+                        return
+                    chunk, siguiente = siguiente, next(chunks, None)
+                    n_rows += len(chunk)
+                    yield chunk
+                    crecimiento = f.tell() - antes
+
+            for data in iter_encoded(parte(), fmt):
+                f.write(data)
+        rutas.append(path)
+    return rutas, n_rows
+
+
+def export_to_static(chunks, fmt='csv', export_dir=EXPORT_DIR, max_bytes=MAX_PART_BYTES):
+    """
+    Escribe una exportación en la carpeta estática de Streamlit.
+
+    El servidor la entrega directamente desde disco, así que la descarga no
+    pasa por la memoria del proceso. Si supera `max_bytes` se parte en varios
+    archivos (ver `write_parts`). Las exportaciones viejas se eliminan.
+
+    Returns:
+        (nombres de archivo, filas escritas)
+    """
+    os.makedirs(export_dir, exist_ok=True)
+    limite = time.time() - EXPORT_TTL_SECONDS
+    for name in os.listdir(export_dir):
+        path = os.path.join(export_dir, name)
+        try:
+            if os.path.getmtime(path) < limite:
+                os.remove(path)
+        except FileNotFoundError:
+            # Otra sesión lo borró al mismo tiempo
+            pass
+
+    extension = FORMATS[fmt][0]
+    base = f"predicciones_{uuid.uuid4().hex[:12]}"
+    rutas, n_rows = write_parts(
+        chunks, lambda n: os.path.join(export_dir, f"{base}_parte{n}{extension}"), fmt, max_bytes,
+    )
+    if len(rutas) == 1:
+        # Una sola parte: nombre sin sufijo
+        os.replace(rutas[0], os.path.join(export_dir, base + extension))
+        return [base + extension], n_rows
+    return [os.path.basename(ruta) for ruta in rutas], n_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta el historial de predicciones por bloques.")
+    parser.add_argument('--input', default=None, help="CSV de predicciones (por defecto, el que usa el dashboard)")
+    parser.add_argument('--output', default='-', help="Archivo de salida ('-' para stdout)")
+    parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+    parser.add_argument('--desde', default=None, help="Fecha/hora inicial (inclusive)")
+    parser.add_argument('--hasta', default=None, help="Fecha/hora final (inclusive)")
+    parser.add_argument('--prob-threshold', type=float, default=0.6)
+    parser.add_argument('--flood-threshold', type=int, default=225)
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    path = args.input or find_data_path()
+    if path is None:
+        parser.error("No se encontró el archivo de datos; indicar --input")
+
+    chunks = iter_window(
+        iter_history(path, args.chunk_rows),
+        desde=args.desde,
+        hasta=args.hasta,
+        prob_threshold=args.prob_threshold,
+        flood_threshold=args.flood_threshold,
+    )
+    output = sys.stdout.buffer if args.output == '-' else args.output
+    n_rows = write_export(chunks, output, args.format)
+    print(f"{n_rows:,} filas exportadas", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
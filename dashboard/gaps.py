@@ -0,0 +1,123 @@
+"""
+Detección de huecos en la serie de tiempo.
+
+El modelo escribe un registro cada 30 minutos, pero un corte del origen
+deja intervalos sin datos. Si el gráfico uniera los puntos vecinos, dibujaría
+una línea falsa sobre el corte. Si además la ventana se tomara por cantidad
+de filas, abarcaría más tiempo del elegido.
+
+`GapIndex` detecta los huecos una sola vez por versión de datos con un único
+`np.diff` sobre los timestamps. Después cada ventana se elige por tiempo
+(`searchsorted`) y devuelve la serie con cortes explícitos y el porcentaje
+de completitud.
+"""
+
+import numpy as np
+
+DEFAULT_INTERVAL = np.timedelta64(30, 'm')
+# Una diferencia mayor a 1,5 intervalos cuenta como hueco
+GAP_TOLERANCE = 1.5
+# Diferencias usadas para inferir la cadencia
+INTERVAL_SAMPLE = 10_000
+
+
+def infer_interval(timestamps):
+    """Cadencia de la serie: mediana de las diferencias más recientes."""
+    if len(timestamps) < 2:
+        return DEFAULT_INTERVAL
+    deltas = np.diff(timestamps[-INTERVAL_SAMPLE:])
+    interval = np.median(deltas)
+    if interval <= np.timedelta64(0, 's'):
+        return DEFAULT_INTERVAL
+    return interval
+
+
+class TrendWindow:
+    """
+    Ventana de tiempo del gráfico de tendencia.
+
+    Las series traen un punto vacío (NaN) en cada hueco, así que el gráfico
+    corta la línea en lugar de unir los extremos.
+    """
+
+    __slots__ = ('inicio', 'fin', 'x', 'alarmas', 'probabilidad', 'esperados', 'presentes', 'huecos')
+
+    def __init__(self, inicio, fin, x, alarmas, probabilidad, esperados, presentes, huecos):
+        self.inicio = inicio
+        self.fin = fin
+        self.x = x
+        self.alarmas = alarmas
+        self.probabilidad = probabilidad
+        self.esperados = esperados
+        self.presentes = presentes
+        # Lista de (último timestamp antes del hueco, primero después, intervalos faltantes)
+        self.huecos = huecos
+
+    @property
+    def completitud(self):
+        """Porcentaje de intervalos esperados que tienen datos."""
+        if self.esperados == 0:
+            return 100.0
+        return 100.0 * min(self.presentes / self.esperados, 1.0)
+
+
+class GapIndex:
+    """
+    Huecos de una serie de tiempo ordenada.
+
+    Args:
+        timestamps: Array datetime64 ordenado.
+        interval: Cadencia esperada (por defecto se infiere de los datos).
+    """
+
+    def __init__(self, timestamps, interval=None):
+        self.timestamps = np.asarray(timestamps)
+        if interval is None:
+            self.interval = infer_interval(self.timestamps)
+        else:
+            self.interval = np.timedelta64(interval)
+
+        deltas = np.diff(self.timestamps)
+        # breaks[k] = i significa que falta al menos un intervalo entre i-1 e i
+        self.breaks = np.flatnonzero(deltas > self.interval * GAP_TOLERANCE) + 1
+        saltos = deltas[self.breaks - 1] / self.interval
+        self.missing = np.rint(saltos).astype(np.int64) - 1
+
+    @classmethod
+    def from_frame(cls, df, interval=None):
+        return cls(df['timestamp'].to_numpy(), interval)
+
+    def window(self, df, horas):
+        """
+        Ventana de las últimas `horas` (por tiempo, no por cantidad de filas).
+
+        La ventana es (fin - horas, fin], con `fin` el último timestamp.
+        """
+        ts = self.timestamps
+        if len(ts) == 0:
+            return TrendWindow(None, None, ts, np.array([]), np.array([]), 0, 0, [])
+
+        fin = ts[-1]
+        inicio = fin - np.timedelta64(int(horas * 3600), 's')
+        i0 = int(ts.searchsorted(inicio, side='right'))
+        esperados = int(round(np.timedelta64(int(horas * 3600), 's') / self.interval))
+        presentes = len(ts) - i0
+
+        # Huecos con ambos extremos dentro de la ventana
+        b0 = int(self.breaks.searchsorted(i0, side='right'))
+        cortes = self.breaks[b0:]
+
+        x = ts[i0:]
+        alarmas = df['active_alarms'].to_numpy()[i0:].astype(float)
+        probabilidad = df['probabilidad_flood'].to_numpy()[i0:]
+        if len(cortes):
+            pos = cortes - i0
+            x = np.insert(x, pos, ts[cortes - 1] + self.interval)
+            alarmas = np.insert(alarmas, pos, np.nan)
+            probabilidad = np.insert(probabilidad, pos, np.nan)
+
+        huecos = [
+            (ts[i - 1], ts[i], int(n))
+            for i, n in zip(cortes, self.missing[b0:])
+        ]
+        return TrendWindow(inicio, fin, x, alarmas, probabilidad, esperados, presentes, huecos)
@@ -0,0 +1,116 @@
+"""
+Objetos vivos compartidos por `app.py` y las páginas de `pages/`.
+
+Es el único módulo del paquete que depende de Streamlit. Los caches de
+Streamlit son globales al proceso, así que todas las páginas y sesiones
+comparten el mismo almacén de snapshots y los mismos objetos calculados
+(estado, tarjetas, gráfico de tendencia, tabla de conteos). Cambiar de
+página sólo cuesta el render.
+"""
+
+import streamlit as st
+
+from dashboard import core
+from dashboard.gaps import GapIndex
+from dashboard.render import RenderGraph
+from dashboard.stores import make_snapshot_store
+from dashboard.whatif import ThresholdTable
+
+# Configuración elegida en el sidebar de app.py; las páginas la leen de aquí
+DEFAULT_SETTINGS = {'prob_threshold': 0.6, 'flood_threshold': 225, 'horas_visualizar': 24}
+_SETTINGS_KEY = 'configuracion_dashboard'
+_RENDER_GRAPH_KEY = 'grafo_render'
+
+
+@st.cache_resource
+def get_snapshot_store():
+    """
+    Almacén de snapshots compartido por todas las sesiones.
+    
+    El refresco corre en un hilo de fondo; los reruns nunca esperan I/O.
+    El origen (snapshot compartido, memoria acotada o archivo completo) lo
+    elige `dashboard.stores`, igual que en la API JSON.
+    """
+    return make_snapshot_store().start()
+
+
+def load_data():
+    """
+    Devuelve el último snapshot de datos de predicción.
+    
+    NOTA: En producción, reemplazar `dashboard.snapshot.load_snapshot` con la salida
+    directa del modelo entrenado.
+    """
+    store = get_snapshot_store()
+    snapshot = store.latest()
+    
+    if snapshot is None:
+        st.error(f"Error cargando datos: {store.error}")
+        return None
+    if store.error is not None:
+        st.warning(f"No se pudieron refrescar los datos ({store.error}). Mostrando el último snapshot.")
+    if snapshot.is_demo:
+        st.warning("No se encontró el archivo de datos. Usando datos de ejemplo.")
+    return snapshot
+
+
+@st.cache_resource(max_entries=4)
+def get_threshold_table(_snapshot, version):
+    """
+    Tabla de conteos acumulados prob × alarmas del snapshot (una por versión).
+    
+    En modo de memoria acotada se usan los conteos persistidos del historial completo.
+    """
+    if _snapshot.history is not None:
+        return ThresholdTable.from_counts(_snapshot.history.counts)
+    df = _snapshot.df
+    return ThresholdTable.from_arrays(df['probabilidad_flood'].to_numpy(), df['active_alarms'].to_numpy())
+
+
+@st.cache_data(max_entries=32)
+def get_status_view(_snapshot, version, prob_threshold, flood_threshold):
+    """
+    Estado actual y tarjetas del snapshot, cacheados por versión y umbrales.
+    """
+    return core.status_view(_snapshot.df, prob_threshold, flood_threshold)
+
+
+@st.cache_resource(max_entries=4)
+def get_gap_index(_snapshot, version):
+    """
+    Huecos de la serie del snapshot (un solo `np.diff` por versión).
+    """
+    return GapIndex.from_frame(_snapshot.df)
+
+
+@st.cache_resource(max_entries=32)
+def get_trend_window(_snapshot, version, horas):
+    """
+    Ventana de tendencia de las últimas `horas`, con cortes en los huecos.
+    """
+    return get_gap_index(_snapshot, version).window(_snapshot.df, horas)
+
+
+@st.cache_resource(max_entries=32)
+def get_trend_figure(_snapshot, version, flood_threshold, horas):
+    """
+    Figura de tendencia compartida (no modificar el objeto devuelto).
+    """
+    return core.plot_simple_trend(get_trend_window(_snapshot, version, horas), flood_threshold)
+
+
+def publish_settings(**settings):
+    """Guarda la configuración del sidebar para que la usen las páginas."""
+    st.session_state[_SETTINGS_KEY] = dict(DEFAULT_SETTINGS, **settings)
+
+
+def current_settings():
+    """Configuración del dashboard principal (o la de por defecto)."""
+    return st.session_state.get(_SETTINGS_KEY, DEFAULT_SETTINGS)
+
+
+def get_render_graph():
+    """Grafo de render de la sesión actual (ver `dashboard.render`)."""
+    if _RENDER_GRAPH_KEY not in st.session_state:
+        st.session_state[_RENDER_GRAPH_KEY] = RenderGraph()
+    return st.session_state[_RENDER_GRAPH_KEY]
@@ -0,0 +1,107 @@
+"""
+Grafo de render con detección de cambios.
+
+Cada sección del dashboard (tarjeta de estado, columnas de información,
+tendencia, métricas...) se declara como un nodo con sus entradas (valores del
+sidebar, snapshot de datos) y sus dependencias (otros nodos). Un nodo sólo se
+recalcula si cambió alguna entrada o se recalculó alguna dependencia; si no,
+devuelve el resultado anterior.
+
+Streamlit exige volver a emitir todos los elementos en cada rerun, así que lo
+que se evita es el cálculo (HTML, figuras, métricas), no el render en sí.
+Los contadores de aciertos y fallos por nodo quedan expuestos para ajustar
+qué entradas declara cada sección.
+"""
+
+import time
+
+import pandas as pd
+
+
+class RenderNode:
+    """Sección del dashboard: función de cálculo más entradas y dependencias."""
+
+    __slots__ = ('name', 'compute', 'inputs', 'deps')
+
+    def __init__(self, name, compute, inputs=(), deps=()):
+        self.name = name
+        self.compute = compute
+        self.inputs = tuple(inputs)
+        self.deps = tuple(deps)
+
+
+class RenderGraph:
+    """
+    Nodos de render con resultados memorizados y contadores.
+
+    Las entradas se comparan por igualdad; los objetos sin `__eq__` propio
+    (como un `Snapshot`) se comparan por identidad, que es justo lo buscado:
+    el almacén devuelve el mismo snapshot mientras los datos no cambien.
+
+    Se usa un grafo por sesión: guarda sólo el último resultado de cada nodo.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.values = {}
+        # nombre -> (clave de entradas, resultado, revisión)
+        self._memo = {}
+        self.stats = {}
+
+    def define(self, name, compute, inputs=(), deps=()):
+        """
+        Declara (o redefine) un nodo. `compute` recibe primero los resultados
+        de `deps`, en orden, y después las entradas como argumentos con nombre.
+        """
+        for dep in deps:
+            if dep not in self.nodes:
+                raise KeyError(f"Dependencia no declarada: {dep}")
+        self.nodes[name] = RenderNode(name, compute, inputs, deps)
+        self.stats.setdefault(name, {'aciertos': 0, 'fallos': 0, 'ms_ultimo': 0.0, 'ms_total': 0.0})
+        return self
+
+    def update(self, **values):
+        """Fija los valores de entrada del rerun actual."""
+        self.values.update(values)
+        return self
+
+    def get(self, name):
+        """Resultado del nodo, recalculado sólo si cambió alguna entrada."""
+        return self._resolve(name, direct=True)
+
+    def _resolve(self, name, direct):
+        # Resolver una dependencia vigente no cuenta como acierto: sólo se
+        # cuentan los pedidos directos de cada sección y los recálculos
+        node = self.nodes[name]
+        dep_values = [self._resolve(dep, direct=False) for dep in node.deps]
+        kwargs = {key: self.values[key] for key in node.inputs}
+        key = (tuple(kwargs.values()), tuple(self._memo[dep][2] for dep in node.deps))
+
+        stats = self.stats[name]
+        memo = self._memo.get(name)
+        if memo is not None and memo[0] == key:
+            if direct:
+                stats['aciertos'] += 1
+            return memo[1]
+
+        inicio = time.perf_counter()
+        value = node.compute(*dep_values, **kwargs)
+        ms = (time.perf_counter() - inicio) * 1000
+        stats['fallos'] += 1
+        stats['ms_ultimo'] = ms
+        stats['ms_total'] += ms
+        # La revisión cambia con cada recálculo: es lo que ven los dependientes
+        self._memo[name] = (key, value, memo[2] + 1 if memo is not None else 0)
+        return value
+
+    def stats_frame(self):
+        """Contadores por nodo (aciertos, fallos, tiempo de cálculo)."""
+        df = pd.DataFrame.from_dict(self.stats, orient='index')
+        df.index.name = 'seccion'
+        total = df['aciertos'] + df['fallos']
+        df['tasa_aciertos'] = (df['aciertos'] / total.where(total > 0)).fillna(0)
+        return df.reset_index()
+
+    def reset_stats(self):
+        for stats in self.stats.values():
+            stats.update(aciertos=0, fallos=0, ms_ultimo=0.0, ms_total=0.0)
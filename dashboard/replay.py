@@ -0,0 +1,304 @@
+"""
+Modo replay: reproduce historial pasado a velocidad acelerada.
+
+Toma una semana de datos (de un CSV existente o del generador sintético) y la
+va agregando al archivo de predicciones que usa el dashboard respetando los
+tiempos originales divididos por la velocidad: a 100× un registro de 30
+minutos llega cada 18 segundos. Las filas entran por el mismo camino que en
+producción:
+
+- el almacén de snapshots de `dashboard.live` (el de `load_data`), incluido
+  el modo de memoria acotada si `FLOOD_RAW_HORIZON_DAYS` está definido;
+- el despachador de alertas (`dashboard.alerts`) leyendo el final del CSV;
+- reruns completos de `app.py` (tarjeta de estado, tendencia, drift...).
+
+Durante el replay se miden la tasa de ingesta, la latencia de ingesta (fila
+escrita → visible en el snapshot), la latencia de render y la memoria del
+proceso. Sirve también como prueba de resistencia de los caminos
+incrementales sin la base de producción.
+
+Uso:
+    python -m dashboard.replay --dias 7 --velocidad 100
+    FLOOD_DATA_PATH=data/replay/salida_predicciones.csv FLOOD_RETENTION_DIR=data/replay/retencion \
+        streamlit run app.py   # seguirlo en vivo
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import shutil
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from dashboard.alerts import AlertDispatcher, CsvTail, LatencyStats, TransitionDetector, parse_sink
+from dashboard.data import COLUMNS, find_data_path, read_history
+from dashboard.retention import STATE_DIR, STATE_DIR_ENV
+from dashboard.synthetic import generate_history
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT_DIR, 'app.py')
+REPLAY_DIR = os.path.join('data', 'replay')
+# Estado del modo de memoria acotada propio del replay (se vacía en cada corrida)
+REPLAY_STATE_DIR = os.path.join(REPLAY_DIR, 'retencion')
+DEFAULT_SPEED = 100
+DEFAULT_DAYS = 7
+DEFAULT_PRELOAD_HOURS = 24
+# Formato fijo: si un lote trae sólo medianoches pandas escribiría sólo la fecha
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+INGEST_TIMEOUT_SECONDS = 30
+POLL_SECONDS = 0.005
+# Tope de espera entre iteraciones: mantiene los reportes periódicos al día
+MAX_SLEEP_SECONDS = 1.0
+
+
+def rss_mb():
+    """RSS actual del proceso en MB (Linux); None si no se puede leer."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError):
+        return None
+
+
+def peak_rss_mb():
+    """Pico de RSS del proceso en MB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_week(origen=None, dias=DEFAULT_DAYS, precarga_horas=DEFAULT_PRELOAD_HOURS, desde=None):
+    """
+    Filas a reproducir: `precarga_horas` de contexto más `dias` de replay.
+
+    Sin `origen` se usa el generador sintético. Con `desde` se toma la semana
+    que empieza en esa fecha; si no, la última semana del archivo.
+
+    Returns:
+        (precarga, replay) como DataFrames con las columnas de `COLUMNS`.
+    """
+    n_replay = int(dias * 48)
+    n_precarga = int(precarga_horas * 2)
+    if origen is None:
+        df = generate_history(n_precarga + n_replay)
+    else:
+        df = read_history(origen)
+
+    if desde is not None:
+        inicio = int(df['timestamp'].searchsorted(pd.Timestamp(desde)))
+    else:
+        fin = df['timestamp'].iloc[-1] - pd.Timedelta(days=dias)
+        inicio = int(df['timestamp'].searchsorted(fin, side='right'))
+    corte = df['timestamp'].iloc[inicio] + pd.Timedelta(days=dias) if inicio < len(df) else None
+    fin = int(df['timestamp'].searchsorted(corte, side='left')) if corte is not None else inicio
+
+    precarga = df.iloc[max(inicio - n_precarga, 0):inicio]
+    replay = df.iloc[inicio:fin]
+    if len(replay) == 0:
+        raise ValueError("No hay filas para reproducir en el rango pedido")
+    return precarga[COLUMNS].reset_index(drop=True), replay[COLUMNS].reset_index(drop=True)
+
+
+def _append(path, rows):
+    rows.to_csv(path, mode='a', header=False, index=False, date_format=DATE_FORMAT)
+
+
+class ReplayReport:
+    """Mediciones acumuladas del replay."""
+
+    def __init__(self):
+        self.filas = 0
+        self.lotes = 0
+        self.ingesta = LatencyStats(maxlen=100_000)
+        self.render = LatencyStats(maxlen=100_000)
+        self.errores_render = 0
+        self.timeouts = 0
+        self.rss_inicial = rss_mb()
+        self.rss_final = None
+        self.inicio = time.perf_counter()
+        self.segundos = 0.0
+
+    def summary(self, alertas):
+        self.rss_final = rss_mb()
+        return {
+            'filas': self.filas,
+            'lotes': self.lotes,
+            'segundos': round(self.segundos, 1),
+            'filas_por_segundo': round(self.filas / self.segundos, 2) if self.segundos else 0.0,
+            'ingesta': self.ingesta.summary(),
+            'render': self.render.summary(),
+            'errores_render': self.errores_render,
+            'timeouts_ingesta': self.timeouts,
+            'alertas': alertas,
+            'rss_inicial_mb': self.rss_inicial,
+            'rss_final_mb': self.rss_final,
+            'rss_pico_mb': peak_rss_mb(),
+        }
+
+
+def _start_alerts(path, sinks):
+    """Corre el despachador de alertas real en un hilo con su propio loop."""
+    dispatcher = AlertDispatcher(CsvTail(path), TransitionDetector(), sinks, poll_seconds=0.1)
+    thread = threading.Thread(target=asyncio.run, args=(dispatcher.run(),), name='replay-alerts', daemon=True)
+    thread.start()
+    return dispatcher
+
+
+def check_output(salida, produccion=None):
+    """
+    Rechaza una salida que pisaría datos de producción.
+
+    `salida` no puede ser el archivo de predicciones de producción
+    (`produccion`, el que resuelve `find_data_path`) ni estar en el directorio
+    del estado de retención de producción (`data/`) o dentro de él.
+
+    Raises:
+        ValueError: Si la salida no es segura.
+    """
+    salida = os.path.abspath(salida)
+    if produccion is not None and salida == os.path.abspath(produccion):
+        raise ValueError(f"{salida} es el archivo de predicciones de producción")
+    carpeta = os.path.dirname(salida)
+    estado = os.path.abspath(STATE_DIR)
+    if carpeta == os.path.dirname(estado) or os.path.commonpath([carpeta, estado]) == estado:
+        raise ValueError(f"{salida} está junto al estado de producción ({estado}); usar {REPLAY_DIR}/")
+
+
+def run_replay(precarga, replay, path, speed=DEFAULT_SPEED, render=True, sinks=None, report_every=60,
+               state_dir=REPLAY_STATE_DIR):
+    """
+    Reproduce `replay` sobre `path` y devuelve el resumen de mediciones.
+
+    `path` debe ser la ruta que resuelve `find_data_path` (ver `FLOOD_DATA_PATH`)
+    y pasar `check_output`. El estado del modo de memoria acotada va a
+    `state_dir`, vacío en cada replay: nunca se toca el estado de producción.
+    """
+    if os.path.abspath(state_dir) == os.path.abspath(STATE_DIR):
+        raise ValueError("El replay no puede usar el estado de retención de producción")
+    carpeta = os.path.dirname(os.path.abspath(path))
+    shutil.rmtree(state_dir, ignore_errors=True)
+    os.environ[STATE_DIR_ENV] = state_dir
+
+    # Importaciones diferidas: sólo el replay necesita Streamlit
+    from dashboard.live import get_snapshot_store
+
+    os.makedirs(carpeta, exist_ok=True)
+    precarga.to_csv(path, index=False, date_format=DATE_FORMAT)
+
+    store = get_snapshot_store()
+    store.refresh()
+    app = None
+    if render:
+        from streamlit.testing.v1 import AppTest
+        app = AppTest.from_file(APP_PATH, default_timeout=120)
+        app.run()
+    dispatcher = _start_alerts(path, sinks or []) if sinks else None
+
+    report = ReplayReport()
+    timestamps = replay['timestamp'].to_numpy()
+    # Instante (en segundos de replay) en que "llega" cada fila
+    llegadas = (timestamps - timestamps[0]) / np.timedelta64(1, 's') / speed
+    pos = 0
+    proximo_reporte = report_every
+
+    while pos < len(replay):
+        transcurrido = time.perf_counter() - report.inicio
+        hasta = int(np.searchsorted(llegadas, transcurrido, side='right'))
+        if hasta == pos:
+            time.sleep(min(llegadas[pos] - transcurrido, MAX_SLEEP_SECONDS))
+            continue
+
+        lote = replay.iloc[pos:hasta]
+        escrito = time.perf_counter()
+        _append(path, lote)
+        pos = hasta
+        report.filas += len(lote)
+        report.lotes += 1
+
+        # Ingesta: hasta que el snapshot de load_data incluye la última fila
+        ultimo = lote['timestamp'].iloc[-1]
+        store.refresh()
+        while True:
+            snapshot = store.latest()
+            if snapshot is not None and len(snapshot.df) and snapshot.df['timestamp'].iloc[-1] >= ultimo:
+                report.ingesta.record(time.perf_counter() - escrito)
+                break
+            if time.perf_counter() - escrito > INGEST_TIMEOUT_SECONDS:
+                report.timeouts += 1
+                logger.warning("La fila %s no llegó al snapshot", ultimo)
+                break
+            time.sleep(POLL_SECONDS)
+
+        if app is not None:
+            t0 = time.perf_counter()
+            app.run()
+            report.render.record(time.perf_counter() - t0)
+            if app.exception:
+                report.errores_render += 1
+                logger.error("Error de render: %s", app.exception[0].value)
+
+        if transcurrido >= proximo_reporte:
+            proximo_reporte += report_every
+            logger.info("Replay %d/%d filas (%s) · ingesta %s · render %s · RSS %.0f MB",
+                        pos, len(replay), ultimo, report.ingesta.summary().get('p50_ms'),
+                        report.render.summary().get('p50_ms'), rss_mb() or 0)
+
+    report.segundos = time.perf_counter() - report.inicio
+    alertas = {}
+    if dispatcher is not None:
+        # Margen para que el despachador lea y notifique las últimas filas
+        time.sleep(1.0)
+        alertas = {name: stats.summary() for name, stats in dispatcher.latency.items()}
+    return report.summary(alertas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduce historial pasado a velocidad acelerada.")
+    parser.add_argument('--origen', default=None,
+                        help="CSV de donde tomar la semana (por defecto, el del dashboard o datos sintéticos)")
+    parser.add_argument('--sinteticos', action='store_true', help="Usar el generador sintético")
+    parser.add_argument('--desde', default=None, help="Fecha inicial (por defecto, la última semana)")
+    parser.add_argument('--dias', type=float, default=DEFAULT_DAYS)
+    parser.add_argument('--velocidad', type=float, default=DEFAULT_SPEED)
+    parser.add_argument('--precarga-horas', type=float, default=DEFAULT_PRELOAD_HOURS)
+    parser.add_argument('--salida', default=os.path.join(REPLAY_DIR, 'salida_predicciones.csv'),
+                        help="CSV donde se escriben las filas reproducidas")
+    parser.add_argument('--sink', action='append', default=[],
+                        help="Sinks de alertas como en dashboard.alerts (por defecto, file en data/replay)")
+    parser.add_argument('--sin-render', action='store_true', help="No ejecutar reruns de app.py")
+    parser.add_argument('--reporte', default=None, help="Guardar el resumen en JSON")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    # La semana se toma antes de redirigir el origen de datos al archivo de replay
+    produccion = find_data_path()
+    origen = None if args.sinteticos else (args.origen or produccion)
+
+    salida = os.path.abspath(args.salida)
+    if origen is not None and os.path.abspath(origen) == salida:
+        parser.error("--salida no puede ser el mismo archivo que --origen")
+    try:
+        check_output(salida, produccion)
+    except ValueError as e:
+        parser.error(f"--salida no válida: {e}")
+    precarga, replay = load_week(origen, args.dias, args.precarga_horas, args.desde)
+    os.environ['FLOOD_DATA_PATH'] = salida
+    sinks = [parse_sink(spec) for spec in (args.sink or [f"file:{os.path.join(REPLAY_DIR, 'alertas.ndjson')}"])]
+
+    print(f"Reproduciendo {len(replay)} filas ({replay['timestamp'].iloc[0]} → {replay['timestamp'].iloc[-1]}) "
+          f"a {args.velocidad:g}× en {salida}")
+    resumen = run_replay(precarga, replay, salida, args.velocidad, not args.sin_render, sinks)
+    print(json.dumps(resumen, indent=2, ensure_ascii=False))
+    if args.reporte:
+        with open(args.reporte, 'w', encoding='utf-8') as f:
+            json.dump(resumen, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
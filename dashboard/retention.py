@@ -0,0 +1,317 @@
+"""
+Modo de memoria acotada para historiales muy largos.
+
+Sólo se mantienen en memoria las filas crudas del horizonte configurado
+(`FLOOD_RAW_HORIZON_DAYS`). Lo anterior se conserva como datos compactos:
+
+- conteos acumulados probabilidad × alarmas (ver `dashboard.whatif`), de los
+  que salen las métricas del modelo para cualquier umbral;
+- rollups diarios (cantidad, sumas y máximos);
+- episodios de flood (inicio, fin, pico) con el umbral por defecto.
+
+El estado se persiste en `data/retencion/` junto con el offset leído del CSV,
+así que cada refresco (y cada reinicio) lee sólo los bytes agregados.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from dashboard.data import data_version, find_data_path, iter_csv_blocks, read_header
+from dashboard.snapshot import Snapshot, load_snapshot, version_mtime
+from dashboard.whatif import MAX_ALARMS, PROB_BINS, count_table
+
+RAW_HORIZON_DAYS = int(os.environ.get('FLOOD_RAW_HORIZON_DAYS', '0'))
+STATE_DIR = os.path.join('data', 'retencion')
+# Directorio de estado alternativo (por ejemplo, el del modo replay)
+STATE_DIR_ENV = 'FLOOD_RETENTION_DIR'
+EPISODE_THRESHOLD = 225
+# Bytes anteriores al offset que se comparan para detectar un CSV reescrito
+FINGERPRINT_BYTES = 64 * 1024
+ALERT_THRESHOLD = 0.6
+
+ROLLUP_COLUMNS = ['n', 'alarmas_suma', 'alarmas_max', 'prob_suma', 'prob_max', 'floods', 'alertas']
+EPISODE_COLUMNS = ['inicio', 'fin', 'pico', 'intervalos']
+RAW_COLUMNS = ['timestamp', 'active_alarms', 'probabilidad_flood']
+
+
+class RetainedHistory:
+    """
+    Historial con retención: ventana cruda + datos compactos.
+
+    Es inmutable: `extend` devuelve una instancia nueva, así que un snapshot
+    en uso nunca cambia mientras se renderiza.
+    """
+
+    def __init__(self, raw, counts, rollups, episodes, open_episode, offset, source, horizon_days,
+                 fingerprint=None):
+        self.raw = raw
+        self.counts = counts
+        self.rollups = rollups
+        self.episodes = episodes
+        self.open_episode = open_episode
+        self.offset = offset
+        self.source = source
+        self.horizon_days = horizon_days
+        # Huella del CSV hasta `offset` (ver `file_fingerprint`)
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def empty(cls, source, horizon_days):
+        raw = pd.DataFrame({
+            'timestamp': pd.Series(dtype='datetime64[ns]'),
+            'active_alarms': pd.Series(dtype=np.int64),
+            'probabilidad_flood': pd.Series(dtype=float),
+        })
+        counts = count_table(np.empty(0), np.empty(0, dtype=np.int64))
+        rollups = pd.DataFrame(columns=ROLLUP_COLUMNS, index=pd.DatetimeIndex([], name='fecha'), dtype=float)
+        episodes = pd.DataFrame(columns=EPISODE_COLUMNS)
+        return cls(raw, counts, rollups, episodes, None, None, source, horizon_days)
+
+    @property
+    def n_rows(self):
+        """Filas procesadas en total (incluidas las ya descartadas)."""
+        return int(self.counts.sum())
+
+    def extend(self, block, offset):
+        """Incorpora un bloque de filas nuevas y devuelve el historial actualizado."""
+        block = block[RAW_COLUMNS]
+        prob = block['probabilidad_flood'].to_numpy(dtype=float)
+        alarms = block['active_alarms'].to_numpy(dtype=np.int64)
+
+        counts = self.counts + count_table(prob, alarms)
+
+        # Ventana cruda: se descarta todo lo anterior al horizonte
+        raw = pd.concat([self.raw, block], ignore_index=True)
+        limite = raw['timestamp'].iloc[-1] - pd.Timedelta(days=self.horizon_days)
+        raw = raw.iloc[raw['timestamp'].searchsorted(limite, side='left'):].reset_index(drop=True)
+
+        # Rollups diarios (sumas: se combinan sumando)
+        dias = block['timestamp'].dt.floor('D')
+        nuevos = pd.DataFrame({
+            'n': 1,
+            'alarmas_suma': alarms,
+            'alarmas_max': alarms,
+            'prob_suma': prob,
+            'prob_max': prob,
+            'floods': (alarms >= EPISODE_THRESHOLD).astype(int),
+            'alertas': (prob >= ALERT_THRESHOLD).astype(int),
+        }, index=dias.to_numpy()).groupby(level=0).agg({
+            'n': 'sum', 'alarmas_suma': 'sum', 'alarmas_max': 'max', 'prob_suma': 'sum',
+            'prob_max': 'max', 'floods': 'sum', 'alertas': 'sum',
+        })
+        rollups = pd.concat([self.rollups, nuevos]).groupby(level=0).agg({
+            'n': 'sum', 'alarmas_suma': 'sum', 'alarmas_max': 'max', 'prob_suma': 'sum',
+            'prob_max': 'max', 'floods': 'sum', 'alertas': 'sum',
+        })
+        rollups.index.name = 'fecha'
+
+        episodes, open_episode = self._extend_episodes(block['timestamp'].to_numpy(), alarms)
+        return RetainedHistory(raw, counts, rollups, episodes, open_episode, offset,
+                               self.source, self.horizon_days)
+
+    def _extend_episodes(self, timestamps, alarms):
+        """Detecta episodios (rachas en flood) continuando el que quedó abierto."""
+        en_flood = alarms >= EPISODE_THRESHOLD
+        cambios = np.flatnonzero(np.diff(en_flood.astype(np.int8))) + 1
+        inicios = list(cambios[en_flood[cambios]])
+        finales = list(cambios[~en_flood[cambios]])
+        if len(en_flood) and en_flood[0]:
+            inicios.insert(0, 0)
+
+        cerrados = []
+        abierto = self.open_episode
+        if abierto is not None and (not len(en_flood) or not en_flood[0]):
+            # El episodio abierto terminó justo en el borde del bloque
+            cerrados.append(abierto)
+            abierto = None
+        for inicio in inicios:
+            fin = next((f for f in finales if f > inicio), len(en_flood))
+            tramo = {
+                'inicio': pd.Timestamp(timestamps[inicio]),
+                'fin': pd.Timestamp(timestamps[fin - 1]),
+                'pico': int(alarms[inicio:fin].max()),
+                'intervalos': int(fin - inicio),
+            }
+            if inicio == 0 and abierto is not None:
+                tramo = {
+                    'inicio': abierto['inicio'],
+                    'fin': tramo['fin'],
+                    'pico': max(abierto['pico'], tramo['pico']),
+                    'intervalos': abierto['intervalos'] + tramo['intervalos'],
+                }
+                abierto = None
+            if fin == len(en_flood):
+                abierto = tramo
+            else:
+                cerrados.append(tramo)
+
+        episodes = self.episodes
+        if cerrados:
+            episodes = pd.concat([episodes, pd.DataFrame(cerrados, columns=EPISODE_COLUMNS)], ignore_index=True)
+        return episodes, abierto
+
+    def all_episodes(self):
+        """Episodios cerrados más el que sigue en curso (si hay)."""
+        if self.open_episode is None:
+            return self.episodes
+        return pd.concat([self.episodes, pd.DataFrame([self.open_episode])], ignore_index=True)
+
+    # ==========================================
+    # PERSISTENCIA
+    # ==========================================
+
+    def save(self, state_dir=STATE_DIR, include_raw=True):
+        """
+        Guarda el estado de forma atómica (archivos temporales + rename).
+
+        Con `include_raw=False` se guardan sólo los datos compactos (el
+        snapshot compartido publica la ventana cruda por separado).
+        """
+        os.makedirs(state_dir, exist_ok=True)
+        arrays = os.path.join(state_dir, 'estado.npz')
+        meta = os.path.join(state_dir, 'estado.json')
+        crudos = {}
+        if include_raw:
+            crudos = {
+                'raw_timestamp': self.raw['timestamp'].to_numpy(dtype='datetime64[ns]').view(np.int64),
+                'raw_alarms': self.raw['active_alarms'].to_numpy(dtype=np.int64),
+                'raw_prob': self.raw['probabilidad_flood'].to_numpy(dtype=float),
+            }
+        with open(arrays + '.tmp', 'wb') as f:
+            np.savez(
+                f,
+                counts=self.counts,
+                **crudos,
+                rollup_fecha=self.rollups.index.to_numpy(dtype='datetime64[ns]').view(np.int64),
+                rollup_valores=self.rollups[ROLLUP_COLUMNS].to_numpy(dtype=float),
+                episodio_inicio=pd.to_datetime(self.episodes['inicio']).to_numpy(dtype='datetime64[ns]').view(np.int64),
+                episodio_fin=pd.to_datetime(self.episodes['fin']).to_numpy(dtype='datetime64[ns]').view(np.int64),
+                episodio_pico=self.episodes['pico'].to_numpy(dtype=np.int64),
+                episodio_intervalos=self.episodes['intervalos'].to_numpy(dtype=np.int64),
+            )
+        abierto = None
+        if self.open_episode is not None:
+            abierto = dict(self.open_episode, inicio=self.open_episode['inicio'].isoformat(),
+                           fin=self.open_episode['fin'].isoformat())
+        with open(meta + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({
+                'source': self.source,
+                'offset': self.offset,
+                'horizon_days': self.horizon_days,
+                'open_episode': abierto,
+                'fingerprint': self.fingerprint,
+            }, f)
+        os.replace(arrays + '.tmp', arrays)
+        os.replace(meta + '.tmp', meta)
+
+    @classmethod
+    def load(cls, state_dir=STATE_DIR, raw=None):
+        """
+        Restaura el estado persistido o devuelve None si no hay.
+
+        `raw` reemplaza la ventana cruda guardada (necesario si se guardó con
+        `include_raw=False`).
+        """
+        meta_path = os.path.join(state_dir, 'estado.json')
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        with np.load(os.path.join(state_dir, 'estado.npz')) as z:
+            if raw is None:
+                raw = pd.DataFrame({
+                    'timestamp': pd.to_datetime(z['raw_timestamp']),
+                    'active_alarms': z['raw_alarms'],
+                    'probabilidad_flood': z['raw_prob'],
+                })
+            rollups = pd.DataFrame(z['rollup_valores'], columns=ROLLUP_COLUMNS,
+                                   index=pd.DatetimeIndex(pd.to_datetime(z['rollup_fecha']), name='fecha'))
+            episodes = pd.DataFrame({
+                'inicio': pd.to_datetime(z['episodio_inicio']),
+                'fin': pd.to_datetime(z['episodio_fin']),
+                'pico': z['episodio_pico'],
+                'intervalos': z['episodio_intervalos'],
+            })
+            counts = z['counts']
+        abierto = meta['open_episode']
+        if abierto is not None:
+            abierto = dict(abierto, inicio=pd.Timestamp(abierto['inicio']), fin=pd.Timestamp(abierto['fin']))
+        return cls(raw, counts, rollups, episodes, abierto, meta['offset'], meta['source'], meta['horizon_days'],
+                   meta.get('fingerprint'))
+
+
+def file_fingerprint(path, offset):
+    """
+    Inodo más hash de los bytes anteriores a `offset`.
+
+    Agregar filas no la cambia; reemplazar o reescribir el archivo sí, aunque
+    el archivo nuevo sea más largo que el offset guardado.
+    """
+    with open(path, 'rb') as f:
+        inicio = max(offset - FINGERPRINT_BYTES, 0)
+        f.seek(inicio)
+        datos = f.read(offset - inicio)
+        return [os.fstat(f.fileno()).st_ino, hashlib.sha1(datos).hexdigest()]
+
+
+def load_retained(path, horizon_days, previous=None, state_dir=STATE_DIR):
+    """
+    Actualiza el historial retenido leyendo sólo los bytes nuevos del CSV.
+
+    Si el estado no corresponde al archivo (otra ruta, otro horizonte, un
+    archivo más corto que el offset guardado o uno reescrito, según
+    `file_fingerprint`) se reconstruye desde cero.
+    """
+    source = os.path.abspath(path)
+    history = previous if previous is not None else RetainedHistory.load(state_dir)
+    size = os.path.getsize(path)
+    if (history is None or history.source != source or history.horizon_days != horizon_days
+            or history.offset is None or history.offset > size
+            or history.counts.shape != (PROB_BINS + 2, MAX_ALARMS + 1)
+            or history.fingerprint != file_fingerprint(path, history.offset)):
+        history = RetainedHistory.empty(source, horizon_days)
+
+    inicial = history
+    start = history.offset if history.offset is not None else read_header(path)[1]
+    for block, offset in iter_csv_blocks(path, start=start, end=size):
+        history = history.extend(block, offset)
+    if history.offset is None:
+        history.offset = start
+    if history is not inicial or history.fingerprint is None:
+        history.fingerprint = file_fingerprint(path, history.offset)
+    if history is not inicial:
+        history.save(state_dir)
+    return history
+
+
+def configured_state_dir():
+    """Directorio de estado: `FLOOD_RETENTION_DIR` o `STATE_DIR`."""
+    return os.environ.get(STATE_DIR_ENV) or STATE_DIR
+
+
+class RetentionLoader:
+    """
+    Loader para `SnapshotStore` en modo de memoria acotada.
+
+    El snapshot resultante tiene como `df` sólo la ventana cruda y expone el
+    historial compacto en `snapshot.history`.
+    """
+
+    def __init__(self, horizon_days=RAW_HORIZON_DAYS, state_dir=STATE_DIR):
+        self.horizon_days = horizon_days
+        self.state_dir = state_dir
+
+    def __call__(self, previous=None):
+        path = find_data_path()
+        if path is None:
+            return load_snapshot(previous)
+        version = data_version(path)
+        if previous is not None and previous.version == version:
+            return previous
+        anterior = previous.history if previous is not None else None
+        history = load_retained(path, self.horizon_days, anterior, self.state_dir)
+        return Snapshot(history.raw, version, path, history=history, modified_at=version_mtime(version))
@@ -0,0 +1,219 @@
+"""
+Snapshot compartido entre procesos mediante archivos mapeados en memoria.
+
+En el modo multi-proceso (ver `dashboard.cluster`) un único publicador carga
+el historial y escribe cada columna como un `.npy` en un directorio
+compartido (por defecto en `/dev/shm`, es decir en RAM). Los workers abren
+esos archivos con `mmap` en sólo lectura y arman el DataFrame sin copiar:
+todas las páginas físicas se comparten, así que sumar workers no duplica el
+dataset.
+
+Cada versión se escribe en una generación nueva y `manifest.json` se
+reemplaza de forma atómica al final, por lo que un worker nunca ve una
+generación a medio escribir.
+
+En modo de memoria acotada se publica además el historial compacto (conteos,
+rollups y episodios) junto a la ventana cruda, así que los workers calculan
+las métricas del modelo sobre el historial completo igual que un proceso solo.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from dashboard.retention import RetainedHistory
+from dashboard.snapshot import DEFAULT_REFRESH_SECONDS, Snapshot, load_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Si está definida, los workers de Streamlit leen el snapshot de este directorio
+SHARED_DIR = os.environ.get('FLOOD_SHARED_SNAPSHOT_DIR', '')
+DEFAULT_SHARED_DIR = '/dev/shm/ypf_flood' if os.path.isdir('/dev/shm') else os.path.join('data', 'compartido')
+# Leer el manifest es barato: los workers lo revisan seguido
+WORKER_REFRESH_SECONDS = 2
+KEEP_GENERATIONS = 2
+MANIFEST = 'manifest.json'
+# Subdirectorio de la generación con el historial compacto
+HISTORY_DIR = 'historial'
+
+
+def _generation_name(version):
+    return hashlib.sha1(repr(version).encode()).hexdigest()[:16]
+
+
+def _to_json(value):
+    if isinstance(value, tuple):
+        return [_to_json(v) for v in value]
+    return value
+
+
+def _from_json(value):
+    if isinstance(value, list):
+        return tuple(_from_json(v) for v in value)
+    return value
+
+
+def publish_snapshot(snapshot, directory=DEFAULT_SHARED_DIR):
+    """
+    Escribe las columnas del snapshot en una generación nueva y la publica.
+
+    Si el snapshot trae historial compacto (`snapshot.history`) se guarda en
+    la misma generación, sin repetir la ventana cruda.
+
+    Returns:
+        Nombre de la generación publicada.
+    """
+    os.makedirs(directory, exist_ok=True)
+    generacion = _generation_name(snapshot.version)
+    destino = os.path.join(directory, generacion)
+
+    if not os.path.isdir(destino):
+        tmp = tempfile.mkdtemp(prefix='.tmp-', dir=directory)
+        for name in snapshot.df.columns:
+            np.save(os.path.join(tmp, f'{name}.npy'), snapshot.df[name].to_numpy())
+        if snapshot.history is not None:
+            snapshot.history.save(os.path.join(tmp, HISTORY_DIR), include_raw=False)
+        os.rename(tmp, destino)
+
+    manifest = {
+        'generacion': generacion,
+        'version': _to_json(snapshot.version),
+        'source': snapshot.source,
+        'filas': len(snapshot.df),
+        'columnas': list(snapshot.df.columns),
+        'historial': snapshot.history is not None,
+        'modificado': snapshot.modified_at,
+        'publicado': datetime.now().isoformat(timespec='seconds'),
+    }
+    fd, tmp = tempfile.mkstemp(prefix='.manifest-', dir=directory)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp, os.path.join(directory, MANIFEST))
+
+    _prune(directory, keep=generacion)
+    return generacion
+
+
+def _prune(directory, keep):
+    """
+    Borra generaciones viejas, conservando las `KEEP_GENERATIONS` más nuevas.
+
+    Un worker que todavía tenga mapeada una generación borrada sigue leyéndola
+    sin problemas: el sistema libera las páginas al cerrar el último mapeo.
+    """
+    generaciones = [
+        entry for entry in os.scandir(directory)
+        if entry.is_dir() and not entry.name.startswith('.') and entry.name != keep
+    ]
+    generaciones.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in generaciones[KEEP_GENERATIONS - 1:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def read_manifest(directory=DEFAULT_SHARED_DIR):
+    """Devuelve el manifest publicado (FileNotFoundError si aún no hay)."""
+    with open(os.path.join(directory, MANIFEST)) as f:
+        return json.load(f)
+
+
+def attach_frame(directory, manifest):
+    """
+    Arma el DataFrame de una generación sobre arrays mapeados (sin copiar).
+
+    Los arrays son de sólo lectura: cualquier intento de modificar el
+    DataFrame en sitio falla en lugar de corromper el snapshot compartido.
+    """
+    base = os.path.join(directory, manifest['generacion'])
+    columns = {
+        name: np.load(os.path.join(base, f'{name}.npy'), mmap_mode='r')
+        for name in manifest['columnas']
+    }
+    return pd.DataFrame(columns, copy=False)
+
+
+def attach_history(directory, manifest, raw):
+    """Historial compacto de una generación (None si no se publicó)."""
+    if not manifest.get('historial'):
+        return None
+    base = os.path.join(directory, manifest['generacion'], HISTORY_DIR)
+    return RetainedHistory.load(base, raw=raw)
+
+
+class SharedSnapshotLoader:
+    """
+    Loader para `SnapshotStore` en los workers: lee el snapshot compartido.
+
+    Sólo relee el manifest en cada revisión; los arrays se mapean de nuevo
+    únicamente cuando el publicador cambió de versión.
+    """
+
+    def __init__(self, directory=SHARED_DIR or DEFAULT_SHARED_DIR):
+        self.directory = directory
+
+    def __call__(self, previous=None):
+        manifest = read_manifest(self.directory)
+        version = _from_json(manifest['version'])
+        if previous is not None and previous.version == version:
+            return previous
+        df = attach_frame(self.directory, manifest)
+        history = attach_history(self.directory, manifest, df)
+        return Snapshot(df, version, manifest['source'], history=history,
+                        modified_at=manifest.get('modificado'))
+
+
+class SnapshotPublisher:
+    """
+    Carga el historial periódicamente y publica cada versión nueva.
+
+    Corre en el proceso lanzador del cluster; es el único que lee el origen.
+
+    Args:
+        directory: Directorio compartido.
+        loader: Función `loader(previous) -> Snapshot` (ver `dashboard.snapshot`).
+        refresh_seconds: Intervalo entre revisiones del origen.
+    """
+
+    def __init__(self, directory=DEFAULT_SHARED_DIR, loader=load_snapshot,
+                 refresh_seconds=DEFAULT_REFRESH_SECONDS):
+        self.directory = directory
+        self.loader = loader
+        self.refresh_seconds = refresh_seconds
+        self.snapshot = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def publish_once(self):
+        """Revisa el origen y publica si cambió. Devuelve True si publicó."""
+        snapshot = self.loader(self.snapshot)
+        if snapshot is self.snapshot:
+            return False
+        generacion = publish_snapshot(snapshot, self.directory)
+        self.snapshot = snapshot
+        logger.info("Snapshot publicado: %s (%d filas)", generacion, len(snapshot.df))
+        return True
+
+    def start(self):
+        """Publica la primera versión y sigue refrescando en un hilo de fondo."""
+        self.publish_once()
+        self._thread = threading.Thread(target=self._run, name='snapshot-publisher', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_seconds):
+            try:
+                self.publish_once()
+            except Exception as e:
+                # Los workers siguen con la última generación publicada
+                logger.error("Error publicando snapshot: %s", e)
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,143 @@
+"""
+Snapshots inmutables del historial con refresco en segundo plano.
+
+Un hilo de fondo revisa periódicamente el origen de datos y, cuando cambia,
+carga un snapshot nuevo y lo publica con un simple reemplazo de referencia.
+Los renders toman siempre el último snapshot completo: su latencia no depende
+de la latencia de I/O del origen.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+
+from dashboard.data import data_version, find_data_path, read_history
+from dashboard.synthetic import generate_history
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_SECONDS = 30
+DEMO_ROWS = 100
+
+
+class Snapshot:
+    """
+    Historial cargado en un instante dado.
+
+    Se comparte entre sesiones e hilos: no debe modificarse. Quien necesite
+    columnas derivadas debe calcularlas sobre arrays propios.
+    """
+
+    __slots__ = ('df', 'version', 'source', 'history', 'loaded_at', 'modified_at')
+
+    def __init__(self, df, version, source, history=None, modified_at=None):
+        self.df = df
+        self.version = version
+        self.source = source
+        # Historial compacto (modo de memoria acotada, ver dashboard.retention)
+        self.history = history
+        self.loaded_at = datetime.now()
+        # Cuándo cambiaron los datos (epoch): la fecha de modificación del origen
+        self.modified_at = modified_at if modified_at is not None else time.time()
+
+    @property
+    def is_demo(self):
+        return self.source is None
+
+
+def load_snapshot(previous=None):
+    """
+    Carga un snapshot desde el archivo de predicciones (o datos de ejemplo).
+
+    Si la versión del archivo no cambió, devuelve `previous` sin releer.
+    """
+    path = find_data_path()
+    if path is None:
+        if previous is not None and previous.is_demo:
+            return previous
+        return Snapshot(generate_history(DEMO_ROWS), ('demo', DEMO_ROWS), None)
+
+    version = data_version(path)
+    if previous is not None and previous.version == version:
+        return previous
+    return Snapshot(read_history(path), version, path, modified_at=version_mtime(version))
+
+
+def version_mtime(version):
+    """Fecha de modificación (epoch) guardada en una versión de `data_version`."""
+    return version[2] / 1e9
+
+
+class SnapshotStore:
+    """
+    Mantiene el último snapshot y lo refresca en un hilo de fondo.
+
+    Args:
+        loader: Función `loader(previous) -> Snapshot`.
+        refresh_seconds: Intervalo entre revisiones del origen.
+    """
+
+    def __init__(self, loader=load_snapshot, refresh_seconds=DEFAULT_REFRESH_SECONDS):
+        self.loader = loader
+        self.refresh_seconds = refresh_seconds
+        self.error = None
+        self._snapshot = None
+        self._ready = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Arranca el hilo de refresco (idempotente)."""
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='snapshot-refresh', daemon=True)
+                self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            self._refresh_once()
+            self._wake.wait(self.refresh_seconds)
+            self._wake.clear()
+
+    def _refresh_once(self):
+        try:
+            snapshot = self.loader(self._snapshot)
+        except Exception as e:
+            # Se conserva el snapshot anterior; el error queda visible para la UI
+            logger.error("Error refrescando datos: %s", e)
+            self.error = e
+        else:
+            self._snapshot = snapshot
+            self.error = None
+        finally:
+            self._ready.set()
+
+    def refresh(self):
+        """Pide un refresco inmediato sin esperar a que termine."""
+        self._wake.set()
+
+    def age_seconds(self):
+        """
+        Segundos desde que cambiaron los datos del snapshot actual.
+
+        Se mide desde la modificación del origen, no desde la última revisión:
+        un CSV que dejó de actualizarse se ve cada vez más viejo aunque el
+        refresco siga funcionando.
+        """
+        if self._snapshot is None:
+            return None
+        return max(time.time() - self._snapshot.modified_at, 0.0)
+
+    def latest(self, timeout=None):
+        """
+        Devuelve el último snapshot completo.
+
+        Sólo la primera llamada puede esperar (hasta la primera carga); después
+        nunca bloquea. Devuelve None si la primera carga falló.
+        """
+        if self._snapshot is None:
+            self._ready.wait(timeout)
+        return self._snapshot
@@ -0,0 +1,34 @@
+"""
+Origen de los snapshots según la configuración del proceso.
+
+Lo comparten `dashboard.live` (Streamlit), `dashboard.api` y el lanzador de
+`dashboard.cluster`, así que no depende de Streamlit. En orden de prioridad:
+
+1. `FLOOD_SHARED_SNAPSHOT_DIR`: el snapshot que publica el cluster (mmap);
+2. `FLOOD_RAW_HORIZON_DAYS`: modo de memoria acotada;
+3. si no, el archivo de predicciones completo.
+"""
+
+from dashboard.retention import RAW_HORIZON_DAYS, RetentionLoader, configured_state_dir
+from dashboard.shm import SHARED_DIR, WORKER_REFRESH_SECONDS, SharedSnapshotLoader
+from dashboard.snapshot import DEFAULT_REFRESH_SECONDS, SnapshotStore, load_snapshot
+
+
+def configured_loader(shared=True):
+    """
+    Loader para `SnapshotStore` según la configuración.
+
+    Con `shared=False` se ignora el snapshot compartido (el publicador del
+    cluster es quien lee el origen).
+    """
+    if shared and SHARED_DIR:
+        return SharedSnapshotLoader(SHARED_DIR)
+    if RAW_HORIZON_DAYS > 0:
+        return RetentionLoader(RAW_HORIZON_DAYS, state_dir=configured_state_dir())
+    return load_snapshot
+
+
+def make_snapshot_store():
+    """Almacén de snapshots (sin arrancar) con el loader configurado."""
+    refresh = WORKER_REFRESH_SECONDS if SHARED_DIR else DEFAULT_REFRESH_SECONDS
+    return SnapshotStore(configured_loader(), refresh)
@@ -0,0 +1,122 @@
+"""
+Generador sintético de historial de predicciones.
+
+Reemplaza los DataFrames aleatorios que antes armaba cada página. Produce
+series con dinámica realista de alarmas (patrón diurno, ráfagas que cruzan el
+umbral de flood y probabilidades correlacionadas con el nivel futuro) y es
+totalmente vectorizado: millones de filas se generan en menos de un segundo.
+
+Uso como carga de trabajo:
+
+    python -m dashboard.synthetic --rows 2000000 --seed 7 --output data/salida_predicciones.csv
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Semilla fija para los datos de demostración (misma vista en cada recarga)
+DEMO_SEED = 42
+
+# Parámetros del modelo de alarmas (intervalos de 30 minutos)
+BASE_ALARMS = 150.0
+DIURNAL_AMPLITUDE = 35.0
+WEEKEND_OFFSET = -15.0
+NOISE_SCALE = 6.0
+NOISE_MEMORY = 8              # intervalos de memoria del ruido suavizado
+BURST_RATE = 1 / 48           # ráfagas por intervalo (≈ 1 por día)
+BURST_MEAN_LENGTH = 6         # intervalos (≈ 3 horas)
+BURST_MEAN_AMPLITUDE = 75.0
+HORIZON_STEPS = 4             # horizonte de predicción: 2 horas
+
+
+def _smooth_noise(rng, n_rows, scale, memory):
+    """Ruido blanco filtrado con un núcleo exponencial (autocorrelado)."""
+    kernel = np.exp(-np.arange(memory * 3) / memory)
+    kernel /= np.sqrt(np.sum(kernel ** 2))
+    white = rng.standard_normal(n_rows + len(kernel) - 1)
+    return np.convolve(white, kernel, mode='valid')[:n_rows] * scale
+
+
+def _bursts(rng, n_rows):
+    """Ráfagas de alarmas como escalones suavizados (array de diferencias)."""
+    n_bursts = rng.poisson(n_rows * BURST_RATE)
+    starts = rng.integers(0, n_rows, n_bursts)
+    lengths = rng.geometric(1 / BURST_MEAN_LENGTH, n_bursts)
+    amplitudes = rng.gamma(4.0, BURST_MEAN_AMPLITUDE / 4.0, n_bursts)
+    ends = np.minimum(starts + lengths, n_rows)
+
+    delta = np.bincount(starts, weights=amplitudes, minlength=n_rows + 1)
+    delta -= np.bincount(ends, weights=amplitudes, minlength=n_rows + 1)
+    steps = np.cumsum(delta[:n_rows])
+
+    # Subida y bajada graduales en lugar de escalones abruptos
+    ramp = np.ones(3) / 3
+    return np.convolve(steps, ramp, mode='full')[:n_rows]
+
+
+def generate_history(n_rows=100, seed=DEMO_SEED, start='2025-01-01', freq='30min',
+                     prob_threshold=0.6, flood_threshold=225):
+    """
+    Genera un historial sintético con el mismo esquema que `salida_predicciones.csv`.
+
+    Args:
+        n_rows: Cantidad de filas (intervalos) a generar.
+        seed: Semilla del generador; la misma semilla produce el mismo historial.
+        start: Fecha de inicio de la serie.
+        freq: Frecuencia de muestreo.
+        prob_threshold: Umbral para derivar `prediccion_flood`.
+        flood_threshold: Umbral de alarmas para derivar `flood_actual`.
+
+    Returns:
+        DataFrame con `timestamp`, `active_alarms`, `probabilidad_flood`,
+        `prediccion_flood` y `flood_actual`.
+    """
+    if n_rows < 1:
+        raise ValueError("n_rows debe ser al menos 1")
+
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range(start=start, periods=n_rows, freq=freq)
+
+    # Patrón diurno (pico por la tarde) y menor actividad en fines de semana
+    hours = timestamps.hour.to_numpy() + timestamps.minute.to_numpy() / 60
+    diurnal = DIURNAL_AMPLITUDE * np.sin(2 * np.pi * (hours - 9) / 24)
+    weekend = np.where(timestamps.dayofweek.to_numpy() >= 5, WEEKEND_OFFSET, 0.0)
+
+    level = (BASE_ALARMS + diurnal + weekend
+             + _smooth_noise(rng, n_rows, NOISE_SCALE, NOISE_MEMORY)
+             + _bursts(rng, n_rows))
+    active_alarms = np.clip(np.rint(level), 0, None).astype(np.int64)
+
+    # La probabilidad mira el nivel dentro del horizonte de 2 horas, con error
+    # autocorrelado para que no sea un oráculo perfecto
+    future = np.concatenate([level[HORIZON_STEPS:],
+                             np.repeat(level[-1:], min(HORIZON_STEPS, n_rows))])
+    logit = (future - flood_threshold) / 15.0 + _smooth_noise(rng, n_rows, 0.8, 4)
+    probabilidad = 1.0 / (1.0 + np.exp(-logit))
+
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'active_alarms': active_alarms,
+        'probabilidad_flood': probabilidad,
+        'prediccion_flood': (probabilidad >= prob_threshold).astype(int),
+        'flood_actual': (active_alarms >= flood_threshold).astype(int),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un historial sintético de predicciones.")
+    parser.add_argument('--rows', type=int, default=100_000, help="Cantidad de filas")
+    parser.add_argument('--seed', type=int, default=DEMO_SEED, help="Semilla del generador")
+    parser.add_argument('--start', default='2025-01-01', help="Fecha de inicio")
+    parser.add_argument('--output', default='salida_predicciones.csv', help="Archivo CSV de salida")
+    args = parser.parse_args()
+
+    df = generate_history(args.rows, seed=args.seed, start=args.start)
+    df.to_csv(args.output, index=False)
+    print(f"{len(df):,} filas escritas en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Simulador de umbrales (what-if).
+
+Construye una única vez una tabla 2-D de conteos acumulados sobre bins de
+probabilidad × bins de cantidad de alarmas. Con ella, la matriz de confusión de
+cualquier combinación (`prob_threshold`, `flood_threshold`) se responde en O(1)
+y la grilla completa del heatmap se resuelve con indexación vectorizada.
+"""
+
+import numpy as np
+
+# Resolución del eje de probabilidad: umbrales múltiplos de 0.01
+PROB_BINS = 100
+# Cantidades de alarmas por encima de este valor comparten el último bin: los
+# umbrales de flood de la UI no pueden superarlo
+MAX_ALARMS = 2000
+
+
+class ThresholdTable:
+    """
+    Conteos acumulados para evaluar umbrales en O(1).
+
+    `cum[i, j]` es la cantidad de filas con fila de conteo >= i y cantidad de
+    alarmas >= j (ver `count_table`: la fila 0 son las probabilidades que
+    nunca superan un umbral). Las filas/columnas extra (con ceros) cubren los
+    umbrales por encima de los valores observados.
+    """
+
+    def __init__(self, cum, prob_bins=PROB_BINS):
+        self.cum = cum
+        self.prob_bins = prob_bins
+
+    @classmethod
+    def from_arrays(cls, probabilidad, active_alarms, prob_bins=PROB_BINS, max_alarms=MAX_ALARMS):
+        """Construye la tabla con un único `bincount` sobre el historial."""
+        counts = count_table(probabilidad, active_alarms, prob_bins, max_alarms)
+        return cls.from_counts(counts, prob_bins)
+
+    @classmethod
+    def from_counts(cls, counts, prob_bins=PROB_BINS):
+        """Construye la tabla a partir de conteos por celda (ver `count_table`)."""
+        cum = np.zeros((counts.shape[0] + 1, counts.shape[1] + 1), dtype=np.int64)
+        cum[:-1, :-1] = counts[::-1, ::-1].cumsum(axis=0).cumsum(axis=1)[::-1, ::-1]
+        return cls(cum, prob_bins)
+
+    @property
+    def total(self):
+        return int(self.cum[0, 0])
+
+    def _indices(self, prob_threshold, flood_threshold):
+        # +1: la fila 0 es la de probabilidades no válidas
+        i = np.clip(np.rint(np.asarray(prob_threshold) * self.prob_bins) + 1, 1, self.cum.shape[0] - 1)
+        j = np.clip(np.ceil(np.asarray(flood_threshold)), 0, self.cum.shape[1] - 1)
+        return i.astype(np.intp), j.astype(np.intp)
+
+    def confusion(self, prob_threshold, flood_threshold):
+        """
+        Matriz de confusión para los umbrales dados.
+
+        Acepta escalares o arrays (con broadcasting) y devuelve un dict con
+        `tp`, `fp`, `fn` y `tn`.
+        """
+        i, j = self._indices(prob_threshold, flood_threshold)
+        tp = self.cum[i, j]
+        pred_pos = self.cum[i, 0]
+        real_pos = self.cum[0, j]
+        fp = pred_pos - tp
+        fn = real_pos - tp
+        tn = self.total - tp - fp - fn
+        return {'tp': tp, 'fp': fp, 'fn': fn, 'tn': tn}
+
+    def grid(self, prob_thresholds, flood_thresholds):
+        """Matrices de confusión para toda la grilla (filas: prob, columnas: flood)."""
+        return self.confusion(
+            np.asarray(prob_thresholds)[:, None],
+            np.asarray(flood_thresholds)[None, :],
+        )
+
+
+def count_table(probabilidad, active_alarms, prob_bins=PROB_BINS, max_alarms=MAX_ALARMS):
+    """
+    Conteos por celda (bin de probabilidad, cantidad de alarmas).
+
+    La fila `i + 1` agrupa probabilidades en [i/prob_bins, (i+1)/prob_bins), de
+    modo que `probabilidad >= k/prob_bins` equivale exactamente a `fila >= k + 1`.
+    La fila 0 junta las probabilidades NaN o negativas: cuentan en el total y
+    en los floods reales, pero nunca como alerta emitida.
+    """
+    prob = np.asarray(probabilidad, dtype=float)
+    edges = np.arange(prob_bins + 1) / prob_bins
+    p_idx = np.searchsorted(edges, prob, side='right')
+    p_idx[np.isnan(prob)] = 0
+    p_idx = np.clip(p_idx, 0, prob_bins + 1)
+    a_idx = np.clip(np.asarray(active_alarms, dtype=np.int64), 0, max_alarms)
+
+    n_rows, n_cols = prob_bins + 2, max_alarms + 1
+    flat = np.bincount(p_idx * n_cols + a_idx, minlength=n_rows * n_cols)
+    return flat.reshape(n_rows, n_cols)
+
+
+def confusion_metrics(tp, fp, fn, tn):
+    """Accuracy, precision, recall y F1 (escalares o arrays), 0 si no hay casos."""
+    tp, fp, fn, tn = (np.asarray(x, dtype=float) for x in (tp, fp, fn, tn))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total = tp + tn + fp + fn
+        accuracy = np.where(total > 0, (tp + tn) / total, 0.0)
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    return {'accuracy': accuracy, 'precision': precision, 'recall': recall, 'f1': f1}
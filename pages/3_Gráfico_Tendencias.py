@@ -4,10 +4,9 @@ Explica cómo construir el gráfico de tendencias desde las tablas SQL
 """
 
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
+
+from dashboard.core import completeness_text
+from dashboard.live import current_settings, get_trend_figure, get_trend_window, load_data
 
 st.set_page_config(
     page_title="Gráfico Tendencias - Documentación",
@@ -22,79 +21,15 @@ st.markdown("---")
 st.markdown("### Ejemplo Visual")
 st.markdown("Así aparece el gráfico de tendencias en el dashboard:")
 
-# Crear datos de ejemplo
-dates = pd.date_range(start='2025-01-15', periods=48, freq='30min')
-df_ejemplo = pd.DataFrame({
-    'timestamp': dates,
-    'active_alarms': np.random.randint(150, 280, 48),
-    'probabilidad_flood': np.random.uniform(0.3, 0.8, 48),
-})
-df_ejemplo['timestamp'] = pd.to_datetime(df_ejemplo['timestamp'])
-
-# Crear gráfico
-flood_threshold = 225
-df_recent = df_ejemplo.copy()
-
-fig = go.Figure()
-
-# Línea de alarmas activas
-fig.add_trace(go.Scatter(
-    x=df_recent['timestamp'],
-    y=df_recent['active_alarms'],
-    mode='lines',
-    name='Alarmas Activas',
-    line=dict(color='#3DCD58', width=3),
-    fill='tozeroy',
-    fillcolor='rgba(61, 205, 88, 0.1)',
-    hovertemplate='%{x}<br>Alarmas: %{y}<extra></extra>'
-))
-
-# Umbral de flood
-fig.add_hline(
-    y=flood_threshold,
-    line_dash="dash",
-    line_color="#DC143C",
-    line_width=2,
-    annotation_text=f"Umbral: {flood_threshold}",
-    annotation_position="right"
-)
-
-# Probabilidad de flood (eje secundario)
-fig.add_trace(go.Scatter(
-    x=df_recent['timestamp'],
-    y=df_recent['probabilidad_flood'] * 100,
-    mode='lines',
-    name='Probabilidad Flood (%)',
-    line=dict(color='#2E9A42', width=2, dash='dot'),
-    yaxis='y2',
-    hovertemplate='%{x}<br>Probabilidad: %{y:.1f}%<extra></extra>'
-))
-
-fig.update_layout(
-    xaxis_title='Tiempo',
-    yaxis_title='Alarmas Activas',
-    yaxis2=dict(
-        title='Probabilidad Flood (%)',
-        overlaying='y',
-        side='right',
-        range=[0, 100]
-    ),
-    hovermode='x unified',
-    template='plotly_white',
-    height=400,
-    legend=dict(
-        orientation="h",
-        yanchor="bottom",
-        y=1.02,
-        xanchor="right",
-        x=1
-    ),
-    margin=dict(l=50, r=50, t=20, b=50),
-    plot_bgcolor='#FFFFFF',
-    paper_bgcolor='#FFFFFF'
-)
+# Gráfico en vivo: mismo snapshot y misma figura cacheada que app.py
+snapshot = load_data()
+if snapshot is None:
+    st.stop()
+config = current_settings()
+fig = get_trend_figure(snapshot, snapshot.version, config['flood_threshold'], config['horas_visualizar'])
 
 st.plotly_chart(fig, use_container_width=True)
+st.caption(completeness_text(get_trend_window(snapshot, snapshot.version, config['horas_visualizar'])))
 
 st.markdown("---")
 
@@ -112,6 +47,11 @@ El **Gráfico de Tendencias** muestra la evolución temporal de:
 - Tooltips al pasar el mouse
 - Zoom y pan habilitados
 - Responsive
+
+### Huecos en los Datos:
+- La ventana se elige **por tiempo** (últimas N horas), no por cantidad de filas
+- Si faltan registros (diferencia mayor a 1,5 intervalos de 30 min), la línea se corta en lugar de unir los extremos
+- Debajo del gráfico se muestra la completitud: intervalos con datos sobre intervalos esperados en la ventana
 """)
 
 st.markdown("---")
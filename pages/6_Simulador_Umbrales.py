@@ -0,0 +1,121 @@
+"""
+Simulador de Umbrales (what-if)
+Muestra cómo habrían cambiado las alertas, falsas alarmas y floods no detectados
+para cada combinación de umbral de probabilidad y umbral de alarmas
+"""
+
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+
+from dashboard.live import get_threshold_table, load_data
+from dashboard.whatif import MAX_ALARMS, confusion_metrics
+
+st.set_page_config(
+    page_title="Simulador de Umbrales",
+    page_icon="",
+    layout="wide"
+)
+
+# Tabla de conteos del snapshot en vivo (compartida con app.py; en modo de
+# memoria acotada cubre el historial completo)
+snapshot = load_data()
+if snapshot is None:
+    st.stop()
+tabla = get_threshold_table(snapshot, snapshot.version)
+
+st.title("Simulador de Umbrales")
+st.markdown("---")
+
+# ==========================================
+# COMBINACIÓN SELECCIONADA
+# ==========================================
+col1, col2 = st.columns(2)
+with col1:
+    prob_threshold = st.slider("Umbral de probabilidad", 0.0, 1.0, 0.6, 0.01)
+with col2:
+    flood_threshold = st.number_input("Umbral de alarmas para flood", min_value=0, max_value=MAX_ALARMS,
+                                      value=225, step=5)
+
+conf = tabla.confusion(prob_threshold, flood_threshold)
+metricas = confusion_metrics(**conf)
+
+col1, col2, col3, col4, col5 = st.columns(5)
+col1.metric("Alertas emitidas", f"{int(conf['tp'] + conf['fp']):,}")
+col2.metric("Falsas alarmas", f"{int(conf['fp']):,}")
+col3.metric("Floods no detectados", f"{int(conf['fn']):,}")
+col4.metric("Recall", f"{float(metricas['recall']):.2%}")
+col5.metric("Precision", f"{float(metricas['precision']):.2%}")
+
+st.markdown("---")
+
+# ==========================================
+# HEATMAP DE LA GRILLA COMPLETA
+# ==========================================
+st.markdown("## Mapa de Umbrales")
+
+opciones = {
+    "F1-Score": lambda c, m: m['f1'] * 100,
+    "Recall (%)": lambda c, m: m['recall'] * 100,
+    "Precision (%)": lambda c, m: m['precision'] * 100,
+    "Alertas emitidas": lambda c, m: c['tp'] + c['fp'],
+    "Falsas alarmas": lambda c, m: c['fp'],
+    "Floods no detectados": lambda c, m: c['fn'],
+}
+col1, col2 = st.columns([2, 1])
+with col1:
+    indicador = st.selectbox("Indicador", list(opciones))
+with col2:
+    paso_alarmas = st.select_slider("Paso del umbral de alarmas", options=[1, 5, 10, 25], value=5)
+
+probs = np.round(np.arange(0, 101, 5) / 100, 2)
+floods = np.arange(0, tabla.cum.shape[1], paso_alarmas)
+# Recortar la grilla al rango de alarmas observado
+max_observado = int(np.flatnonzero(tabla.cum[0] > 0)[-1]) if tabla.total else 0
+floods = floods[floods <= max_observado + paso_alarmas]
+
+grilla = tabla.grid(probs, floods)
+valores = opciones[indicador](grilla, confusion_metrics(**grilla))
+
+fig = go.Figure(go.Heatmap(
+    x=floods,
+    y=probs,
+    z=valores,
+    colorscale='RdYlGn' if indicador in ("F1-Score", "Recall (%)", "Precision (%)") else 'RdYlGn_r',
+    hovertemplate='Umbral alarmas: %{x}<br>Umbral prob.: %{y:.2f}<br>' + indicador + ': %{z:,.1f}<extra></extra>'
+))
+fig.add_trace(go.Scatter(
+    x=[flood_threshold],
+    y=[prob_threshold],
+    mode='markers',
+    marker=dict(symbol='x', size=14, color='#333333'),
+    name='Selección',
+    hoverinfo='skip'
+))
+fig.update_layout(
+    xaxis_title='Umbral de alarmas para flood',
+    yaxis_title='Umbral de probabilidad',
+    template='plotly_white',
+    height=500,
+    margin=dict(l=50, r=50, t=20, b=50),
+    showlegend=False
+)
+st.plotly_chart(fig, use_container_width=True)
+
+st.markdown("---")
+
+st.markdown("""
+## Cómo se Calcula
+
+Al cargar los datos se arma una única tabla de conteos acumulados sobre
+bins de probabilidad (resolución 0.01) × cantidad de alarmas. Para cualquier
+combinación de umbrales:
+
+- **Verdaderos positivos**: filas con probabilidad ≥ umbral y alarmas ≥ umbral de flood
+- **Alertas emitidas**: filas con probabilidad ≥ umbral
+- **Floods reales**: filas con alarmas ≥ umbral de flood
+
+Cada valor es una sola lectura de la tabla, por lo que el mapa completo se
+calcula al instante aun con varios años de historial. La tabla es la misma que usa el
+dashboard principal y se reconstruye sólo cuando cambia el snapshot de datos.
+""")
@@ -0,0 +1,102 @@
+"""
+Tests del lector incremental y los sinks de alertas.
+"""
+
+import asyncio
+
+import pytest
+
+from dashboard.alerts import AlertDispatcher, CsvTail, Sink, TransitionDetector
+from dashboard.synthetic import generate_history
+
+
+def _csv(tmp_path, n_rows):
+    path = tmp_path / 'salida_predicciones.csv'
+    generate_history(n_rows).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize('n_rows', [1, 5])
+def test_seed_keeps_every_row_of_small_files(tmp_path, n_rows):
+    assert len(CsvTail(_csv(tmp_path, n_rows)).seed()) == n_rows
+
+
+def test_seed_drops_only_partial_line_of_large_files(tmp_path):
+    df = CsvTail(_csv(tmp_path, 20_000)).seed()
+    assert 0 < len(df) < 20_000
+    assert df['timestamp'].notna().all()
+    assert df['timestamp'].iloc[-1] == generate_history(20_000)['timestamp'].iloc[-1]
+
+
+def test_read_new_reports_file_write_time(tmp_path):
+    path = _csv(tmp_path, 10)
+    tail = CsvTail(path)
+    tail.seed()
+    with open(path, 'a') as f:
+        f.write('2030-01-01 00:00:00,300,0.9,1,1\n')
+    nuevas = tail.read_new()
+    assert len(nuevas) == 1
+    assert tail.mtime is not None
+
+    eventos = TransitionDetector(debounce_rows=1)
+    eventos.seed(generate_history(10))
+    assert eventos.feed(nuevas, arrival=tail.mtime)[0]['_llegada'] == tail.mtime
+
+
+class RecordingSink(Sink):
+    name = 'registro'
+
+    def __init__(self):
+        self.eventos = []
+
+    def emit(self, evento):
+        self.eventos.append(evento)
+
+
+class FailingSink(Sink):
+    name = 'roto'
+
+    def emit(self, evento):
+        raise OSError("sin conexión")
+
+
+def _fila(minutos, alarmas, prob):
+    return f'2030-01-01 {minutos // 60:02d}:{minutos % 60:02d}:00,{alarmas},{prob},0,0\n'
+
+
+def test_dispatcher_notifies_every_sink_once(tmp_path):
+    path = tmp_path / 'salida_predicciones.csv'
+    with open(path, 'w') as f:
+        f.write('timestamp,active_alarms,probabilidad_flood,prediccion_flood,flood_actual\n')
+        f.writelines(_fila(30 * i, 100, 0.1) for i in range(4))
+
+    registro = RecordingSink()
+    dispatcher = AlertDispatcher(CsvTail(str(path)), TransitionDetector(debounce_rows=2),
+                                 [registro, FailingSink()], poll_seconds=0.01)
+
+    async def escenario():
+        tarea = asyncio.create_task(dispatcher.run())
+        await asyncio.sleep(0.1)
+        with open(path, 'a') as f:
+            # Una fila aislada no alcanza el debounce; dos seguidas sí
+            f.writelines([_fila(120, 100, 0.9), _fila(150, 100, 0.1),
+                          _fila(180, 100, 0.9), _fila(210, 100, 0.9)])
+        for _ in range(200):
+            if registro.eventos:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.1)
+        tarea.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await tarea
+
+    asyncio.run(escenario())
+
+    assert len(registro.eventos) == 1
+    evento = registro.eventos[0]
+    assert (evento['senal'], evento['estado_alerta']) == ('prediccion_flood', 'ALERTA')
+    assert evento['timestamp'] == '2030-01-01T03:30:00'
+    assert '_llegada' not in evento
+    # El sink que falla no bloquea al resto ni registra latencia
+    assert dispatcher.latency['registro'].summary()['n'] == 1
+    assert dispatcher.latency['roto'].summary()['n'] == 0
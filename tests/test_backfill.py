@@ -0,0 +1,92 @@
+"""
+Tests del backfill contra el stand-in SQLite.
+"""
+
+import sqlite3
+
+import pytest
+
+from dashboard.backfill import (
+    CHECKPOINT_TABLE,
+    OUTPUT_TABLE,
+    import_raw_csv,
+    partitions,
+    run_backfill,
+)
+from dashboard.synthetic import generate_history
+
+N_ROWS = 90 * 48  # tres meses de intervalos de 30 minutos
+
+
+def _silencio(*_):
+    pass
+
+
+def _importar(tmp_path, db_path, n_rows=N_ROWS):
+    csv_path = tmp_path / f'alarmas_{n_rows}.csv'
+    generate_history(n_rows)[['timestamp', 'active_alarms']].to_csv(csv_path, index=False)
+    return import_raw_csv(str(csv_path), db_path)
+
+
+def _salida(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(
+            f"SELECT timestamp, prediccion_flood, probabilidad_flood, estado_alerta, active_actual "
+            f"FROM {OUTPUT_TABLE} ORDER BY timestamp"
+        ).fetchall()
+
+
+@pytest.fixture
+def db_limpia(tmp_path):
+    db_path = str(tmp_path / 'limpia.sqlite')
+    _importar(tmp_path, db_path)
+    run_backfill(db_path, workers=2, progress=_silencio)
+    return db_path
+
+
+def test_resume_matches_clean_run(tmp_path, db_limpia):
+    db_path = str(tmp_path / 'retomada.sqlite')
+    _importar(tmp_path, db_path)
+    run_backfill(db_path, workers=2, progress=_silencio)
+
+    # Simula una interrupción: dos particiones sin checkpoint ni filas escritas
+    perdidas = partitions(db_path)[:2]
+    with sqlite3.connect(db_path) as conn:
+        for inicio, fin in perdidas:
+            conn.execute(f"DELETE FROM {CHECKPOINT_TABLE} WHERE inicio = ?", (inicio,))
+            conn.execute(f"DELETE FROM {OUTPUT_TABLE} WHERE timestamp >= ? AND timestamp < ?", (inicio, fin))
+    assert len(_salida(db_path)) < N_ROWS
+
+    resumen = run_backfill(db_path, workers=2, progress=_silencio)
+
+    total = len(partitions(db_path))
+    # Las dos perdidas más la última partición, que siempre se vuelve a puntuar
+    assert resumen['procesadas'] == len(perdidas) + 1
+    assert resumen['omitidas'] == total - len(perdidas) - 1
+    assert len(_salida(db_path)) == len(_salida(db_limpia)) == N_ROWS
+    assert _salida(db_path) == _salida(db_limpia)
+
+
+def test_checkpoints_are_keyed_by_partition_size(tmp_path, db_limpia):
+    resumen = run_backfill(db_limpia, workers=2, freq='D', progress=_silencio)
+
+    assert resumen['omitidas'] == 0
+    assert resumen['procesadas'] == len(partitions(db_limpia, 'D'))
+    assert len(_salida(db_limpia)) == N_ROWS
+
+
+def test_open_partition_is_rescored_with_new_rows(tmp_path):
+    db_path = str(tmp_path / 'abierta.sqlite')
+    _importar(tmp_path, db_path, N_ROWS - 200)
+    run_backfill(db_path, workers=1, progress=_silencio)
+    assert len(_salida(db_path)) == N_ROWS - 200
+
+    # Llegan filas nuevas dentro de la misma (última) partición mensual
+    _importar(tmp_path, db_path, N_ROWS)
+    resumen = run_backfill(db_path, workers=1, progress=_silencio)
+
+    assert resumen['procesadas'] == 1
+    assert len(_salida(db_path)) == N_ROWS
+    with sqlite3.connect(db_path) as conn:
+        registradas = conn.execute(f"SELECT COUNT(*) FROM {CHECKPOINT_TABLE}").fetchone()[0]
+    assert registradas == len(partitions(db_path)) - 1
@@ -0,0 +1,41 @@
+"""
+Tests del monitor de drift incremental.
+"""
+
+import pandas as pd
+
+from dashboard.drift import RollingMetrics
+from dashboard.synthetic import generate_history
+
+
+def test_sliding_window_keeps_accumulated_windows():
+    df = generate_history(20 * 48)
+    completo = RollingMetrics('D').sync(df).frame()
+
+    # Ventana cruda de 3 días que avanza medio día por refresco
+    monitor = RollingMetrics('D')
+    for fin in range(3 * 48, len(df) + 1, 24):
+        monitor.sync(df.iloc[max(fin - 3 * 48, 0):fin])
+
+    assert monitor.n_rows == len(df)
+    pd.testing.assert_frame_equal(monitor.frame(), completo)
+
+
+def test_rewritten_history_resets_accumulators():
+    df = generate_history(5 * 48)
+    monitor = RollingMetrics('D').sync(df)
+
+    reescrito = df.copy()
+    reescrito.loc[len(df) - 1, 'active_alarms'] += 1
+    monitor.sync(reescrito)
+
+    assert monitor.n_rows == len(df)
+    pd.testing.assert_frame_equal(monitor.frame(), RollingMetrics('D').sync(reescrito).frame())
+
+
+def test_truncated_history_resets_accumulators():
+    df = generate_history(5 * 48)
+    monitor = RollingMetrics('D').sync(df)
+    monitor.sync(df.iloc[:48])
+
+    assert monitor.n_rows == 48
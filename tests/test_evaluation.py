@@ -0,0 +1,32 @@
+"""
+Tests del registro de evaluaciones en la base local.
+"""
+
+import sqlite3
+
+import pytest
+
+pytest.importorskip('sklearn')
+
+from dashboard.evaluation import FOLDS_TABLE, cached_features, latest_results, run_evaluation  # noqa: E402
+from dashboard.synthetic import generate_history  # noqa: E402
+
+
+def test_latest_results_returns_last_run_within_same_second(tmp_path):
+    df = generate_history(30 * 48)
+    x_path, y_path = cached_features(df['timestamp'].to_numpy(), df['active_alarms'].to_numpy(),
+                                     cache_dir=str(tmp_path / 'cache'))
+    db_path = str(tmp_path / 'evaluacion.sqlite')
+
+    run_ids = [
+        run_evaluation(x_path, y_path, 'random_forest', n_candidatos=1, n_folds=2, workers=1,
+                       seed=seed, db_path=db_path, progress=lambda *_: None)
+        for seed in (1, 2)
+    ]
+
+    run, folds = latest_results(db_path)
+    assert run['run_id'] == run_ids[-1]
+    assert len(folds) == 2
+    with sqlite3.connect(db_path) as conn:
+        guardados = {r[0] for r in conn.execute(f"SELECT DISTINCT run_id FROM {FOLDS_TABLE}")}
+    assert guardados == set(run_ids)
@@ -0,0 +1,57 @@
+"""
+Tests de la exportación por bloques y de la lectura incremental del CSV.
+"""
+
+import pandas as pd
+import pytest
+
+from dashboard.data import COLUMNS, iter_csv_blocks, iter_frame
+from dashboard.export import export_to_static, iter_window
+from dashboard.synthetic import generate_history
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'ndjson'])
+def test_exportacion_en_partes(tmp_path, fmt):
+    df = generate_history(5000)
+    chunks = iter_window(iter_frame(df, chunk_rows=500))
+    filenames, n_rows = export_to_static(chunks, fmt, export_dir=str(tmp_path), max_bytes=60_000)
+
+    assert n_rows == len(df)
+    assert len(filenames) > 1
+    partes = []
+    for filename in filenames:
+        path = tmp_path / filename
+        # Un bloque de margen sobre el límite, nunca más
+        assert path.stat().st_size < 60_000 + 50_000
+        if fmt == 'csv':
+            partes.append(pd.read_csv(path))
+        else:
+            partes.append(pd.read_json(path, lines=True))
+    unido = pd.concat(partes, ignore_index=True)
+    assert list(unido.columns) == COLUMNS
+    assert len(unido) == len(df)
+
+
+def test_exportacion_chica_en_un_archivo(tmp_path):
+    df = generate_history(100)
+    filenames, n_rows = export_to_static(iter_window(iter_frame(df)), 'csv', export_dir=str(tmp_path))
+    assert n_rows == 100
+    assert len(filenames) == 1 and '_parte' not in filenames[0]
+
+
+def test_ultima_linea_sin_salto(tmp_path):
+    path = tmp_path / 'salida_predicciones.csv'
+    texto = generate_history(10).to_csv(index=False)
+    path.write_text(texto.rstrip('\n'))
+
+    bloques = list(iter_csv_blocks(str(path), block_bytes=64))
+    assert sum(len(df) for df, _ in bloques) == 10
+    assert bloques[-1][1] == path.stat().st_size
+
+
+def test_archivo_achicado_no_se_cuelga(tmp_path):
+    path = tmp_path / 'salida_predicciones.csv'
+    generate_history(10).to_csv(path, index=False)
+    # `end` más allá del tamaño real: como si el archivo se hubiera achicado
+    bloques = list(iter_csv_blocks(str(path), end=path.stat().st_size + 10_000))
+    assert sum(len(df) for df, _ in bloques) == 10
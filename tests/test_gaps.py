@@ -0,0 +1,68 @@
+"""
+Tests de la detección de huecos y las ventanas por tiempo.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard.gaps import GapIndex
+
+
+def _serie(n_rows=48, faltantes=()):
+    ts = pd.date_range('2025-01-01', periods=n_rows, freq='30min')
+    df = pd.DataFrame({
+        'timestamp': ts,
+        'active_alarms': np.arange(n_rows),
+        'probabilidad_flood': np.linspace(0, 1, n_rows),
+    })
+    return df.drop(index=list(faltantes)).reset_index(drop=True)
+
+
+def test_serie_completa():
+    df = _serie()
+    ventana = GapIndex.from_frame(df).window(df, 6)
+    assert ventana.huecos == []
+    assert ventana.esperados == ventana.presentes == 12
+    assert ventana.completitud == 100.0
+    assert len(ventana.x) == 12
+    assert ventana.x[-1] == df['timestamp'].iloc[-1]
+    assert not np.isnan(ventana.alarmas).any()
+
+
+def test_hueco_dentro_de_la_ventana():
+    df = _serie(faltantes=(40, 41, 42))
+    ventana = GapIndex.from_frame(df).window(df, 6)
+
+    assert ventana.esperados == 12
+    assert ventana.presentes == 9
+    assert ventana.completitud == 75.0
+    assert len(ventana.huecos) == 1
+    antes, despues, faltan = ventana.huecos[0]
+    assert despues - antes == pd.Timedelta(hours=2)
+    assert faltan == 3
+    # Un punto vacío corta la línea en el hueco
+    assert len(ventana.x) == 10
+    assert np.isnan(ventana.alarmas).sum() == 1
+    assert np.isnan(ventana.probabilidad).sum() == 1
+
+
+def test_ventana_por_tiempo_no_por_filas():
+    df = _serie(faltantes=range(30, 44))
+    ventana = GapIndex.from_frame(df).window(df, 6)
+    # Sólo 4 filas caen en las últimas 6 horas; no se completan con filas más viejas
+    assert ventana.presentes == 4
+    assert ventana.x.min() > df['timestamp'].iloc[-1] - pd.Timedelta(hours=6)
+
+
+def test_hueco_anterior_a_la_ventana_no_aparece():
+    df = _serie(faltantes=(5, 6))
+    ventana = GapIndex.from_frame(df).window(df, 6)
+    assert ventana.huecos == []
+    assert ventana.completitud == 100.0
+
+
+def test_serie_vacia():
+    df = _serie(0)
+    ventana = GapIndex.from_frame(df).window(df, 24)
+    assert ventana.presentes == 0
+    assert ventana.completitud == 100.0
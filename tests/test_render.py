@@ -0,0 +1,84 @@
+"""
+Tests del grafo de render (aciertos, fallos e invalidación).
+"""
+
+import pytest
+
+from dashboard.render import RenderGraph
+
+
+def _grafo(llamadas):
+    def base(umbral):
+        llamadas.append('base')
+        return umbral * 2
+
+    def derivado(valor_base, horas):
+        llamadas.append('derivado')
+        return valor_base + horas
+
+    grafo = RenderGraph()
+    grafo.define('base', base, inputs=('umbral',))
+    grafo.define('derivado', derivado, inputs=('horas',), deps=('base',))
+    return grafo
+
+
+def _stats(grafo, name):
+    stats = grafo.stats[name]
+    return stats['aciertos'], stats['fallos']
+
+
+def test_mismas_entradas_reutilizan_el_resultado():
+    llamadas = []
+    grafo = _grafo(llamadas).update(umbral=1, horas=24)
+    assert grafo.get('derivado') == 26
+    assert grafo.get('derivado') == 26
+    assert llamadas == ['base', 'derivado']
+    assert _stats(grafo, 'derivado') == (1, 1)
+    # Resolver `base` como dependencia no cuenta como acierto
+    assert _stats(grafo, 'base') == (0, 1)
+
+
+def test_cambio_de_entrada_propia_no_recalcula_dependencias():
+    llamadas = []
+    grafo = _grafo(llamadas).update(umbral=1, horas=24)
+    grafo.get('derivado')
+    grafo.update(horas=48)
+    assert grafo.get('derivado') == 50
+    assert llamadas == ['base', 'derivado', 'derivado']
+
+
+def test_cambio_en_dependencia_invalida_dependientes():
+    llamadas = []
+    grafo = _grafo(llamadas).update(umbral=1, horas=24)
+    grafo.get('derivado')
+    grafo.update(umbral=5)
+    assert grafo.get('derivado') == 34
+    assert llamadas == ['base', 'derivado', 'base', 'derivado']
+    assert _stats(grafo, 'derivado') == (0, 2)
+
+
+def test_entradas_se_comparan_por_igualdad():
+    llamadas = []
+    grafo = _grafo(llamadas).update(umbral=1, horas=24)
+    grafo.get('derivado')
+    # Otro objeto con el mismo valor no invalida
+    grafo.update(umbral=1.0, horas=int('24'))
+    grafo.get('derivado')
+    assert _stats(grafo, 'derivado') == (1, 1)
+    assert llamadas == ['base', 'derivado']
+
+
+def test_dependencia_no_declarada():
+    with pytest.raises(KeyError):
+        RenderGraph().define('huerfano', lambda x: x, deps=('base',))
+
+
+def test_stats_frame_y_reset():
+    grafo = _grafo([]).update(umbral=1, horas=24)
+    grafo.get('derivado')
+    grafo.get('derivado')
+    df = grafo.stats_frame().set_index('seccion')
+    assert df.loc['derivado', 'tasa_aciertos'] == 0.5
+    assert df.loc['base', 'tasa_aciertos'] == 0.0
+    grafo.reset_stats()
+    assert _stats(grafo, 'derivado') == (0, 0)
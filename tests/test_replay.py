@@ -0,0 +1,26 @@
+"""
+Tests de las protecciones del modo replay.
+"""
+
+import os
+
+import pytest
+
+from dashboard.replay import REPLAY_DIR, check_output
+
+
+@pytest.mark.parametrize('salida', [
+    os.path.join('data', 'otro.csv'),
+    os.path.join('data', 'retencion', 'salida.csv'),
+    os.path.join('prueba', 'salida_predicciones.csv'),
+])
+def test_rechaza_salidas_de_produccion(tmp_path, monkeypatch, salida):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError):
+        check_output(salida, os.path.join('prueba', 'salida_predicciones.csv'))
+
+
+def test_acepta_salida_de_replay(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    check_output(os.path.join(REPLAY_DIR, 'salida_predicciones.csv'), os.path.join('data', 'salida_predicciones.csv'))
+    check_output(str(tmp_path / 'otra' / 'salida.csv'))
@@ -0,0 +1,40 @@
+"""
+Tests del modo de memoria acotada.
+"""
+
+from dashboard.retention import load_retained
+from dashboard.synthetic import generate_history
+
+HORIZON_DAYS = 7
+
+
+def test_csv_reescrito_se_reconstruye(tmp_path):
+    csv_path = tmp_path / 'salida_predicciones.csv'
+    state_dir = str(tmp_path / 'retencion')
+    generate_history(20 * 48, seed=1).to_csv(csv_path, index=False)
+    primero = load_retained(str(csv_path), HORIZON_DAYS, state_dir=state_dir)
+    assert primero.n_rows == 20 * 48
+
+    # Se reescribe (no se agrega) con un archivo más largo que el offset guardado
+    nuevo = generate_history(30 * 48, seed=2)
+    nuevo.to_csv(csv_path, index=False)
+
+    # Tanto desde memoria como desde el estado persistido (reinicio)
+    for previous in (primero, None):
+        history = load_retained(str(csv_path), HORIZON_DAYS, previous, state_dir=state_dir)
+        assert history.n_rows == len(nuevo)
+        assert history.raw['timestamp'].iloc[-1] == nuevo['timestamp'].iloc[-1]
+
+
+def test_agregar_filas_lee_solo_lo_nuevo(tmp_path):
+    csv_path = tmp_path / 'salida_predicciones.csv'
+    state_dir = str(tmp_path / 'retencion')
+    df = generate_history(20 * 48)
+    df.iloc[:10 * 48].to_csv(csv_path, index=False)
+    primero = load_retained(str(csv_path), HORIZON_DAYS, state_dir=state_dir)
+
+    df.iloc[10 * 48:].to_csv(csv_path, mode='a', header=False, index=False)
+    history = load_retained(str(csv_path), HORIZON_DAYS, state_dir=state_dir)
+    assert history.n_rows == len(df)
+    assert history.fingerprint[0] == primero.fingerprint[0]
+    assert len(history.rollups) == 20
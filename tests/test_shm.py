@@ -0,0 +1,38 @@
+"""
+Tests del snapshot compartido entre procesos.
+"""
+
+import numpy as np
+
+from dashboard.retention import load_retained
+from dashboard.shm import SharedSnapshotLoader, publish_snapshot
+from dashboard.snapshot import Snapshot
+from dashboard.synthetic import generate_history
+
+HORIZON_DAYS = 7
+
+
+def test_publica_historial_compacto(tmp_path):
+    csv_path = tmp_path / 'salida_predicciones.csv'
+    generate_history(30 * 48).to_csv(csv_path, index=False)
+    historial = load_retained(str(csv_path), HORIZON_DAYS, state_dir=str(tmp_path / 'retencion'))
+    snapshot = Snapshot(historial.raw, ('prueba', 1), str(csv_path), history=historial)
+
+    compartido = tmp_path / 'compartido'
+    publish_snapshot(snapshot, str(compartido))
+    leido = SharedSnapshotLoader(str(compartido))()
+
+    assert len(leido.df) == len(historial.raw)
+    assert leido.history is not None
+    assert leido.history.raw is leido.df
+    assert leido.modified_at == snapshot.modified_at
+    assert leido.history.n_rows == historial.n_rows > len(leido.df)
+    np.testing.assert_array_equal(leido.history.counts, historial.counts)
+    assert len(leido.history.rollups) == len(historial.rollups)
+    assert len(leido.history.all_episodes()) == len(historial.all_episodes())
+
+
+def test_sin_historial(tmp_path):
+    snapshot = Snapshot(generate_history(48), ('prueba', 2), 'demo')
+    publish_snapshot(snapshot, str(tmp_path))
+    assert SharedSnapshotLoader(str(tmp_path))().history is None
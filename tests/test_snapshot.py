@@ -0,0 +1,24 @@
+"""
+Tests del almacén de snapshots.
+"""
+
+import os
+import time
+
+from dashboard.snapshot import SnapshotStore, load_snapshot
+from dashboard.synthetic import generate_history
+
+
+def test_antiguedad_desde_modificacion(tmp_path, monkeypatch):
+    csv_path = tmp_path / 'salida_predicciones.csv'
+    generate_history(48).to_csv(csv_path, index=False)
+    # El CSV dejó de actualizarse hace una hora
+    hace_una_hora = time.time() - 3600
+    os.utime(csv_path, (hace_una_hora, hace_una_hora))
+    monkeypatch.setenv('FLOOD_DATA_PATH', str(csv_path))
+
+    store = SnapshotStore(load_snapshot)
+    assert store.age_seconds() is None
+    store._refresh_once()
+    # Recién revisado, pero los datos siguen teniendo una hora
+    assert store.age_seconds() >= 3600
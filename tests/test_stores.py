@@ -0,0 +1,23 @@
+"""
+Tests de la elección del origen de snapshots.
+"""
+
+from dashboard import stores
+from dashboard.retention import RetentionLoader
+from dashboard.shm import WORKER_REFRESH_SECONDS, SharedSnapshotLoader
+from dashboard.snapshot import load_snapshot
+
+
+def test_prioridad_de_origenes(monkeypatch, tmp_path):
+    monkeypatch.setattr(stores, 'SHARED_DIR', str(tmp_path))
+    monkeypatch.setattr(stores, 'RAW_HORIZON_DAYS', 30)
+    assert isinstance(stores.configured_loader(), SharedSnapshotLoader)
+    assert isinstance(stores.configured_loader(shared=False), RetentionLoader)
+    assert stores.make_snapshot_store().refresh_seconds == WORKER_REFRESH_SECONDS
+
+    monkeypatch.setattr(stores, 'SHARED_DIR', '')
+    assert isinstance(stores.configured_loader(), RetentionLoader)
+
+    monkeypatch.setattr(stores, 'RAW_HORIZON_DAYS', 0)
+    assert stores.configured_loader() is load_snapshot
+
@@ -0,0 +1,78 @@
+"""
+Tests del simulador de umbrales (tabla de conteos acumulados).
+"""
+
+import numpy as np
+
+from dashboard.synthetic import generate_history
+from dashboard.whatif import MAX_ALARMS, ThresholdTable, count_table
+
+PROBS = np.round(np.arange(0, 101, 5) / 100, 2)
+FLOODS = np.array([0, 1, 100, 225, 500, MAX_ALARMS])
+
+
+def _datos_con_nan(n_rows=5000):
+    df = generate_history(n_rows)
+    prob = df['probabilidad_flood'].to_numpy(dtype=float).copy()
+    prob[::97] = np.nan
+    return prob, df['active_alarms'].to_numpy()
+
+
+def _directa(prob, alarms, prob_threshold, flood_threshold):
+    pred = prob >= prob_threshold
+    real = alarms >= flood_threshold
+    return {
+        'tp': int((pred & real).sum()),
+        'fp': int((pred & ~real).sum()),
+        'fn': int((~pred & real).sum()),
+        'tn': int((~pred & ~real).sum()),
+    }
+
+
+def test_confusion_con_nan_coincide_con_mascaras():
+    prob, alarms = _datos_con_nan()
+    tabla = ThresholdTable.from_arrays(prob, alarms)
+    assert tabla.total == len(prob)
+    for p in PROBS:
+        for f in FLOODS:
+            conf = {k: int(v) for k, v in tabla.confusion(p, f).items()}
+            assert conf == _directa(prob, alarms, p, f), (p, f)
+
+
+def test_grid_con_nan_coincide_con_mascaras():
+    prob, alarms = _datos_con_nan()
+    grilla = ThresholdTable.from_arrays(prob, alarms).grid(PROBS, FLOODS)
+    for a, p in enumerate(PROBS):
+        for b, f in enumerate(FLOODS):
+            directa = _directa(prob, alarms, p, f)
+            assert {k: int(v[a, b]) for k, v in grilla.items()} == directa, (p, f)
+
+
+def test_confusion_suma_el_total_y_acepta_arrays():
+    df = generate_history(2000)
+    tabla = ThresholdTable.from_arrays(df['probabilidad_flood'].to_numpy(), df['active_alarms'].to_numpy())
+    escalar = tabla.confusion(0.6, 225)
+    assert sum(int(v) for v in escalar.values()) == tabla.total == len(df)
+
+    arrays = tabla.confusion(np.array([0.2, 0.6]), 225)
+    assert int(arrays['tp'][1]) == int(escalar['tp'])
+    assert arrays['tp'].shape == (2,)
+
+
+def test_umbrales_por_encima_de_lo_observado():
+    tabla = ThresholdTable.from_arrays(np.array([0.3, 0.5]), np.array([10, 20]))
+    conf = {k: int(v) for k, v in tabla.confusion(1.0, MAX_ALARMS).items()}
+    assert conf == {'tp': 0, 'fp': 0, 'fn': 0, 'tn': 2}
+
+
+def test_alarmas_sobre_el_maximo_comparten_el_ultimo_bin():
+    tabla = ThresholdTable.from_arrays(np.array([0.9, 0.9]), np.array([MAX_ALARMS, MAX_ALARMS + 500]))
+    assert int(tabla.confusion(0.5, MAX_ALARMS)['tp']) == 2
+
+
+def test_from_counts_por_bloques_igual_a_from_arrays():
+    # Así acumula los conteos el modo de memoria acotada
+    prob, alarms = _datos_con_nan(3000)
+    completa = ThresholdTable.from_arrays(prob, alarms)
+    conteos = count_table(prob[:1000], alarms[:1000]) + count_table(prob[1000:], alarms[1000:])
+    np.testing.assert_array_equal(ThresholdTable.from_counts(conteos).cum, completa.cum)